@@ -1,3 +1,5 @@
+import glob
+import threading
 import time
 from io import TextIOWrapper
 import os.path
@@ -7,6 +9,8 @@ import test
 import actions_rollback
 
 ACTION_LOG_FILE = "actions_log.latest.log"
+# each worker processing datasets concurrently has its own actions log file
+ACTION_LOG_FILE_PATTERN = "actions_log.latest*.log"
 ACTION_SEQUENCE_RENAMING_TRIES = 10
 
 
@@ -27,26 +31,25 @@ def create_object(object_type: str, object_name: str) -> Action:
     return Action(object_type, object_name)
 
 
+_sequence_file_lock = threading.Lock()
+_thread_local = threading.local()
+
+
 class ActionsLogger:
     __instance = None
 
-    def __init__(self):
-        if ActionsLogger.__instance is not None:
-            raise Exception(
-                "This class is a singleton! Created once, otherwise use ActionsLogger.get()"
-            )
-        else:
-            self.log: List[Action] = []
-            self.file: Optional[TextIOWrapper] = None
-            ActionsLogger.__instance = self
+    def __init__(self, log_file: str = ACTION_LOG_FILE):
+        self.log: List[Action] = []
+        self.file: Optional[TextIOWrapper] = None
+        self.log_file = log_file
 
     @staticmethod
     def get():
         """
-        Static access method, return instance of Settings or instantiate it.
+        Static access method, return instance of main ActionsLogger or instantiate it.
         """
         if ActionsLogger.__instance is None:
-            ActionsLogger()
+            ActionsLogger.__instance = ActionsLogger()
         return ActionsLogger.__instance
 
     def new_actions_log(self):
@@ -59,12 +62,12 @@ class ActionsLogger:
         if self.file:  # we have the file still opened
             # no need to do rollback here, because it will close and stay on filesystem
             self.close_file()
-        if len(self.log) != 0 or os.path.isfile(ACTION_LOG_FILE):
+        if len(self.log) != 0 or os.path.isfile(self.log_file):
             Logger.log(1, "found old actions log, rolling back")
             self.rollback()
 
         # buffering=1 means, it will flush the file after each line
-        self.file = open(ACTION_LOG_FILE, "w+", encoding="utf-8", buffering=1)
+        self.file = open(self.log_file, "w+", encoding="utf-8", buffering=1)
 
     def log_pre(self, object_type: str, name: str):
         """
@@ -117,8 +120,8 @@ class ActionsLogger:
         Logger.log(4, "actions log finished, removing file")
 
         self.log = []
-        if os.path.isfile(ACTION_LOG_FILE):
-            os.remove(ACTION_LOG_FILE)
+        if os.path.isfile(self.log_file):
+            os.remove(self.log_file)
             Logger.log(4, "actions log finished, removed file")
 
     def print_actions_log(self):
@@ -226,8 +229,8 @@ class ActionsLogger:
         if not include_file:
             return log_sequence
 
-        if os.path.isfile(ACTION_LOG_FILE):
-            file_sequence = self.build_file_sequence(ACTION_LOG_FILE)
+        if os.path.isfile(self.log_file):
+            file_sequence = self.build_file_sequence(self.log_file)
 
         final_sequence = self.merge_sequences(log_sequence, file_sequence)
 
@@ -263,13 +266,15 @@ class ActionsLogger:
         serialized_out = ActionsLogger.serialize_sequence(sequence)
 
         filename = "rollback.sequence"
-        for try_number in range(ACTION_SEQUENCE_RENAMING_TRIES):
-            if not os.path.isfile(filename):
-                with open(filename, "w+", encoding="utf-8") as file:
-                    file.write(serialized_out)
-                return True
+        # rollbacks of concurrently processed datasets must not choose the same file
+        with _sequence_file_lock:
+            for try_number in range(ACTION_SEQUENCE_RENAMING_TRIES):
+                if not os.path.isfile(filename):
+                    with open(filename, "w+", encoding="utf-8") as file:
+                        file.write(serialized_out)
+                    return True
 
-            filename = "rollback_" + Utils.create_uuid(4) + ".sequence"
+                filename = "rollback_" + Utils.create_uuid(4) + ".sequence"
 
         return False
 
@@ -355,4 +360,27 @@ class ActionsLogger:
 
 
 def get_actions_logger() -> ActionsLogger:
-    return ActionsLogger.get()
+    """
+    Returns actions logger of current thread. Workers processing datasets concurrently have their own loggers,
+    so rollback of one dataset does not touch actions of the others.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return ActionsLogger.get()
+
+    if not hasattr(_thread_local, "actions_logger"):
+        log_file = f"actions_log.latest.{threading.current_thread().name}.log"
+        _thread_local.actions_logger = ActionsLogger(log_file)
+    return _thread_local.actions_logger
+
+
+def rollback_unfinished_logs() -> None:
+    """
+    Rollbacks actions of all logs left by previous run (of main thread and of workers) and removes them.
+    """
+    for log_file in sorted(glob.glob(ACTION_LOG_FILE_PATTERN)):
+        if log_file == ACTION_LOG_FILE:
+            actions_logger = ActionsLogger.get()
+        else:
+            actions_logger = ActionsLogger(log_file)
+        actions_logger.new_actions_log()
+        actions_logger.finish_actions_log()
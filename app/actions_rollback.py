@@ -8,8 +8,6 @@ import filesystem
 from utils import Settings
 from utils import Logger
 
-NUMBER_OF_TRIES_IF_NOT_FOUND = 3
-
 
 def action_space(space_name: str, space_id: str) -> bool:
     """
@@ -25,32 +23,17 @@ def action_space(space_name: str, space_id: str) -> bool:
         Logger.log(1, f"rollback - no space name nor space id was provided")
         return False
 
-    space = None
-    search_successful = False
-
-    for try_number in range(1, NUMBER_OF_TRIES_IF_NOT_FOUND + 1):
-        Logger.log(3, f"rollback - getting space from id {space_id}, try {try_number}/{NUMBER_OF_TRIES_IF_NOT_FOUND}")
-        if space_id:
-            space = spaces.get_space_from_onezone(space_id)  # space got, no need to change space id
-
-        if space:
-            search_successful = True
-            break
-
-        Logger.log(3, f"rollback - id is not correct, not rolling back {space_name}")
+    if not space_id:
         # space_id = spaces.get_space_id_by_name(space_name)
-
-        if space_id:
-            search_successful = True
-            break
-
-        time.sleep(3 * Settings.get().config["sleepFactor"])
-
-    # it is ok, because we do not have to delete space
-    if not search_successful:
+        # it is ok, because we do not have to delete space
         Logger.log(3, "rollback - space does not exist on server, everything is OK")
         return True
 
+    # transient errors of Onedata are retried by request layer
+    Logger.log(3, f"rollback - getting space from id {space_id}")
+    if not spaces.get_space_from_onezone(space_id):
+        Logger.log(3, f"rollback - space with id {space_id} not found, trying to remove it anyway")
+
     Logger.log(3, f"rollback - removing space with id {space_id}")
     response = spaces.removeSpace(space_id)
     Logger.log(3, f"rollback - space with id {space_id} removed: {response.ok}")
@@ -77,32 +60,17 @@ def action_storage(storage_name: str, storage_id: str) -> bool:
         Logger.log(1, f"rollback - no storage name nor storage id was provided")
         return False
 
-    storage = None
-    search_successful = False
-
-    for try_number in range(1, NUMBER_OF_TRIES_IF_NOT_FOUND + 1):
-        Logger.log(3, f"rollback - getting storage from id {storage_id}, try {try_number}/{NUMBER_OF_TRIES_IF_NOT_FOUND}")
-        if storage_id:
-            storage = storages.getStorageDetails(storage_id)  # storage got, no need to change storage id
-
-        if storage:
-            search_successful = True
-            break
-
-        Logger.log(3, f"rollback - id is not correct, not rolling back {storage_name}")
+    if not storage_id:
         # storage_id = storages.get_storage_id_by_name(storage_name)
-
-        if storage_id:
-            search_successful = True
-            break
-
-        time.sleep(3 * Settings.get().config["sleepFactor"])
-
-    # it is ok, because we do not have to delete storage
-    if not search_successful:
+        # it is ok, because we do not have to delete storage
         Logger.log(3, "rollback - storage does not exist on server, everything is OK")
         return True
 
+    # transient errors of Onedata are retried by request layer
+    Logger.log(3, f"rollback - getting storage from id {storage_id}")
+    if not storages.getStorageDetails(storage_id):
+        Logger.log(3, f"rollback - storage with id {storage_id} not found, trying to remove it anyway")
+
     Logger.log(3, f"rollback - removing storage with id {storage_id}")
     response = storages.removeStorage(storage_id)
     Logger.log(3, f"rollback - storage with id {storage_id} removed: {response.ok}")
@@ -125,32 +93,17 @@ def action_group(group_name: str, group_id: str):
         Logger.log(1, f"rollback - no group name nor group id was provided")
         return False
 
-    group = None
-    search_successful = False
-
-    for try_number in range(1, NUMBER_OF_TRIES_IF_NOT_FOUND + 1):
-        Logger.log(3, f"rollback - getting group from id {group_id}, try {try_number}/{NUMBER_OF_TRIES_IF_NOT_FOUND}")
-        if group_id:
-            group = groups.get_group_details(group_id)  # group got, no need to change group id
-
-        if group:
-            search_successful = True
-            break
-
-        Logger.log(3, f"rollback - id is not correct, not rolling back {group_name}")
+    if not group_id:
         # group_id = groups.get_group_id_by_name(group_name)
-
-        if group_id:
-            search_successful = True
-            break
-
-        time.sleep(3 * Settings.get().config["sleepFactor"])
-
-    # it is ok, because we do not have to delete group
-    if not search_successful:
+        # it is ok, because we do not have to delete group
         Logger.log(3, "rollback - group does not exist on server, everything is OK")
         return True
 
+    # transient errors of Onedata are retried by request layer
+    Logger.log(3, f"rollback - getting group from id {group_id}")
+    if not groups.get_group_details(group_id):
+        Logger.log(3, f"rollback - group with id {group_id} not found, trying to remove it anyway")
+
     Logger.log(3, f"rollback - removing group with id {group_id}")
     response = groups.removeGroup(group_id)
     Logger.log(3, f"rollback - group with id {group_id} removed: {response.ok}")
@@ -172,32 +125,21 @@ def action_token(token_name: str, token_id: str) -> bool:
         Logger.log(1, f"rollback - no token name nor token id was provided")
         return False
 
+    # transient errors of Onedata are retried by request layer
     token = None
-    search_successful = False
-
-    for try_number in range(1, NUMBER_OF_TRIES_IF_NOT_FOUND + 1):
-        Logger.log(3, f"rollback - getting token from id {token_id}, try {try_number}/{NUMBER_OF_TRIES_IF_NOT_FOUND}")
-        if token_id:
-            token = tokens.getNamedToken(token_id)  # token got, no need to change token id
-
-        if token:
-            search_successful = True
-            break
+    if token_id:
+        Logger.log(3, f"rollback - getting token from id {token_id}")
+        token = tokens.getNamedToken(token_id)  # token got, no need to change token id
 
+    if not token:
         Logger.log(3, f"rollback - id is not correct, getting from name {token_name}")
         response = tokens.get_users_named_token_by_name(token_name)
+        if not response.ok:
+            # it is ok, because we do not have to delete token
+            Logger.log(3, "rollback - token does not exist on server, everything is OK")
+            return True
 
-        if response.ok:
-            token_id = response.json()["id"]
-            search_successful = True
-            break
-
-        time.sleep(3 * Settings.get().config["sleepFactor"])
-
-    # it is ok, because we do not have to delete token
-    if not search_successful:
-        Logger.log(3, "rollback - token does not exist on server, everything is OK")
-        return True
+        token_id = response.json()["id"]
 
     Logger.log(3, f"rollback - removing token with id {token_id}")
     response = tokens.deleteNamedToken(token_id)
@@ -0,0 +1,130 @@
+"""
+Asyncio transport for communication with Onezone, Oneproviders and Onepanels.
+Coroutines of this module have the same signatures as functions of module request.
+Requests are sent using the same pooled sessions as the synchronous transport (in a thread pool),
+so everything done by the request layer (logging, statistics) is shared by both transports.
+Number of requests in flight is bounded for each endpoint (Onezone and each of Oneproviders).
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from settings import Settings
+import request
+
+# processing of url is not blocking, sharing it with synchronous transport
+process_url = request.process_url
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# semaphores are bound to the event loop, in which they are used
+_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def is_enabled() -> bool:
+    """
+    Returns True if asyncio transport is selected in configuration file.
+    """
+    return Settings.get().config["restClient"]["transport"] == "asyncio"
+
+
+def get_max_concurrency() -> int:
+    """
+    Returns maximal number of requests in flight for each endpoint.
+    """
+    return Settings.get().config["restClient"]["asyncio"]["maxConcurrencyPerProvider"]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Onezone and each of Oneproviders can have maximal number of requests in flight
+            number_of_endpoints = 1 + len(Settings.get().ONEPROVIDERS_API_URL)
+            _executor = ThreadPoolExecutor(
+                max_workers=get_max_concurrency() * number_of_endpoints,
+                thread_name_prefix="async_request"
+            )
+
+    return _executor
+
+
+def _get_semaphore(endpoint: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    loop_semaphores = _semaphores.setdefault(loop, dict())
+    if endpoint not in loop_semaphores:
+        loop_semaphores[endpoint] = asyncio.Semaphore(get_max_concurrency())
+
+    return loop_semaphores[endpoint]
+
+
+async def _run_bounded(endpoint: str, function, *args, **kwargs):
+    """
+    Runs blocking function of request module in thread pool when endpoint has free slot.
+    """
+    async with _get_semaphore(endpoint):
+        loop = asyncio.get_running_loop()
+        # context is copied, so context variables of caller are visible in request layer
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, function, *args, **kwargs)
+        return await loop.run_in_executor(_get_executor(), call)
+
+
+def run(coroutine):
+    """
+    Runs given coroutine from synchronous code and returns its result.
+    """
+    return asyncio.run(coroutine)
+
+
+async def get(url, headers=dict(), ok_statuses: tuple = tuple(), oneprovider_index: int = 0, use_cache: bool = True,
+              retries: Optional[int] = None):
+    endpoint = request.get_endpoint_name(url, oneprovider_index)
+    return await _run_bounded(
+        endpoint, request.get, url, headers=headers, ok_statuses=ok_statuses, oneprovider_index=oneprovider_index,
+        use_cache=use_cache, retries=retries
+    )
+
+
+async def patch(url, headers=dict(), data=dict(), oneprovider_index: int = 0, retries: Optional[int] = None):
+    endpoint = request.get_endpoint_name(url, oneprovider_index)
+    return await _run_bounded(
+        endpoint, request.patch, url, headers=headers, data=data, oneprovider_index=oneprovider_index, retries=retries
+    )
+
+
+async def put(url, headers=dict(), data=dict(), oneprovider_index: int = 0, retries: Optional[int] = None):
+    endpoint = request.get_endpoint_name(url, oneprovider_index)
+    return await _run_bounded(
+        endpoint, request.put, url, headers=headers, data=data, oneprovider_index=oneprovider_index, retries=retries
+    )
+
+
+async def post(url, headers=dict(), data=dict(), oneprovider_index: int = 0, ok_statuses: tuple = tuple(),
+               retries: Optional[int] = None):
+    endpoint = request.get_endpoint_name(url, oneprovider_index)
+    return await _run_bounded(
+        endpoint, request.post, url, headers=headers, data=data, oneprovider_index=oneprovider_index,
+        ok_statuses=ok_statuses, retries=retries
+    )
+
+
+async def delete(url, headers=dict(), data=dict(), oneprovider_index: int = 0, ok_statuses: tuple = tuple(),
+                 retries: Optional[int] = None):
+    endpoint = request.get_endpoint_name(url, oneprovider_index)
+    return await _run_bounded(
+        endpoint, request.delete, url, headers=headers, data=data, oneprovider_index=oneprovider_index,
+        ok_statuses=ok_statuses, retries=retries
+    )
+
+
+async def collect(url, iterator_function, *args, oneprovider_index: int = 0, **kwargs) -> list:
+    """
+    Runs streaming function (generator using request.iter_json_array) in thread pool and returns list of its items.
+    Url and oneprovider_index select endpoint, which slot is occupied for the whole iteration.
+    """
+    endpoint = request.get_endpoint_name(url, oneprovider_index)
+    return await _run_bounded(endpoint, lambda: list(iterator_function(*args, **kwargs)))
@@ -0,0 +1,192 @@
+"""
+Recording of requests and responses to cassette and their replaying without network.
+Cassette is gzip compressed file with one JSON object per line. Authentication headers are never stored
+and values of secret fields (tokens, passwords) in bodies are redacted.
+Requests are matched by endpoint, method, path and body, so cassette can be replayed with different hosts.
+Identical requests are answered in recorded order, the last answer is repeated (e.g. for polling).
+When recording, streamed responses (listings) are downloaded whole before they are parsed, so memory usage
+of recording run is not the same as of normal run. Replayed responses are streamed from memory.
+"""
+import atexit
+import base64
+import collections
+import gzip
+import json
+import threading
+import time
+import urllib.parse
+from typing import Optional
+import requests
+from settings import Settings
+from utils import Logger
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+REDACTED = "<redacted>"
+SECRET_KEYS = ("token", "password", "secret")
+# headers of responses which are used by fs2od, others are not stored
+STORED_HEADERS = ("Content-Type", "Location", "ETag", "Last-Modified", "Retry-After")
+
+_lock = threading.Lock()
+_record_file = None
+_interactions: Optional[dict] = None
+
+
+def get_mode() -> str:
+    return Settings.get().config["restClient"]["cassette"]["mode"]
+
+
+def is_recording() -> bool:
+    return get_mode() == MODE_RECORD
+
+
+def is_replaying() -> bool:
+    return get_mode() == MODE_REPLAY
+
+
+def _is_secret_key(key: str) -> bool:
+    return key.lower() in SECRET_KEYS or key.endswith("Token")
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {key: REDACTED if _is_secret_key(key) and isinstance(item, str) else _redact(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _redact_data(data) -> str:
+    """
+    Returns body of request (dict, JSON string or bytes) as canonical JSON string with redacted secrets.
+    """
+    if data is None:
+        return ""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", errors="replace")
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return data
+    return json.dumps(_redact(data), sort_keys=True)
+
+
+def _redact_body(content: bytes) -> bytes:
+    try:
+        return json.dumps(_redact(json.loads(content))).encode("utf-8")
+    except ValueError:
+        return content
+
+
+def _get_key(method: str, url: str, endpoint: str, data) -> tuple:
+    parsed_url = urllib.parse.urlsplit(url)
+    path = parsed_url.path + ("?" + parsed_url.query if parsed_url.query else "")
+    return endpoint, method.upper(), path, _redact_data(data)
+
+
+def record(method: str, url: str, endpoint: str, data, response: requests.Response, elapsed: float) -> None:
+    """
+    Appends request and its response to cassette. Body of streamed response is downloaded whole
+    (response.content), the caller then iterates over the downloaded body.
+    """
+    global _record_file
+    endpoint_name, method, path, request_data = _get_key(method, url, endpoint, data)
+    body = _redact_body(response.content)
+    try:
+        stored_body, encoding = body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        stored_body, encoding = base64.b64encode(body).decode("ascii"), "base64"
+
+    interaction = {
+        "endpoint": endpoint_name,
+        "method": method,
+        "path": path,
+        "data": request_data,
+        "status": response.status_code,
+        "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+        "body": stored_body,
+        "encoding": encoding,
+        "elapsed": round(elapsed, 6),
+    }
+
+    with _lock:
+        if _record_file is None:
+            path_to_cassette = Settings.get().config["restClient"]["cassette"]["path"]
+            Logger.log(3, f"Recording requests to cassette {path_to_cassette}")
+            _record_file = gzip.open(path_to_cassette, "wt", encoding="utf-8")
+            atexit.register(close)
+        _record_file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+
+def _load() -> dict:
+    path_to_cassette = Settings.get().config["restClient"]["cassette"]["path"]
+    interactions = collections.defaultdict(collections.deque)
+    with gzip.open(path_to_cassette, "rt", encoding="utf-8") as file:
+        for line in file:
+            interaction = json.loads(line)
+            key = (interaction["endpoint"], interaction["method"], interaction["path"], interaction["data"])
+            interactions[key].append(interaction)
+
+    Logger.log(3, f"Replaying {sum(len(queue) for queue in interactions.values())} requests "
+                  f"from cassette {path_to_cassette}")
+    return interactions
+
+
+def replay(method: str, url: str, endpoint: str, data) -> requests.Response:
+    """
+    Returns recorded response to given request after recorded latency multiplied by latencyScale.
+    If request is not in cassette, response with status code 404 is returned immediately.
+    """
+    global _interactions
+    key = _get_key(method, url, endpoint, data)
+    with _lock:
+        if _interactions is None:
+            _interactions = _load()
+        queue = _interactions.get(key)
+        if not queue:
+            interaction = None
+        elif len(queue) > 1:
+            interaction = queue.popleft()
+        else:
+            interaction = queue[0]
+
+    if interaction is None:
+        Logger.log(2, f"{method} {url} not found in cassette")
+        body = b'{"error": {"id": "notFound", "description": "Request not found in cassette"}}'
+        return _create_response(url, 404, {"Content-Type": "application/json"}, body)
+
+    latency_scale = Settings.get().config["restClient"]["cassette"]["latencyScale"]
+    if latency_scale > 0:
+        time.sleep(interaction["elapsed"] * latency_scale)
+
+    if interaction["encoding"] == "base64":
+        body = base64.b64decode(interaction["body"])
+    else:
+        body = interaction["body"].encode("utf-8")
+    return _create_response(url, interaction["status"], interaction["headers"], body)
+
+
+def _create_response(url: str, status_code: int, headers: dict, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response.headers.update(headers)
+    response.headers["Content-Length"] = str(len(body))
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+def close() -> None:
+    """
+    Finishes writing of recorded cassette.
+    """
+    global _record_file
+    with _lock:
+        if _record_file is not None:
+            _record_file.close()
+            _record_file = None
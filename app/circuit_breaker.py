@@ -0,0 +1,253 @@
+"""
+Circuit breakers for endpoints (Onezone, each of Oneproviders and DAREG).
+After several consecutive failed requests the breaker of endpoint opens and requests to the endpoint
+fail immediately without waiting for timeouts. After a while one request is let through (half-open state)
+and its result decides whether the breaker closes again.
+Datasets which requests were skipped are written to journal and their processing is not recorded as complete
+in state index. Skipped requests are not sent again (registration is rolled back and started from scratch),
+the datasets are processed again in the next scan.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from typing import Optional
+import requests
+import state_index
+from settings import Settings
+from utils import Logger
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half-open"
+
+# status code of responses returned for skipped requests
+SKIPPED_STATUS_CODE = 503
+
+
+class CircuitBreaker:
+    def __init__(self, endpoint: str, failure_threshold: int, reset_timeout: float):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.skipped_requests = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Returns True if request to the endpoint can be sent.
+        """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                Logger.log(3, f"Circuit breaker of {self.endpoint} is half-open, trying one request")
+                self.state = STATE_HALF_OPEN
+
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.skipped_requests += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != STATE_CLOSED:
+                Logger.log(3, f"Circuit breaker of {self.endpoint} closed, endpoint is responding again")
+            self.state = STATE_CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        Called when request was not finished for reason unrelated to the endpoint (e.g. exceeded deadline),
+        the state is kept and another request can try the endpoint.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN or \
+                    (self.state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold):
+                Logger.log(2, f"Circuit breaker of {self.endpoint} opened after {self.consecutive_failures} "
+                              f"failed requests, requests to it are skipped for {self.reset_timeout} s")
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+
+
+_breakers: dict = {}
+_breakers_lock = threading.Lock()
+_journal_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return Settings.get().config["restClient"]["circuitBreaker"]["enabled"]
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """
+    Returns circuit breaker of given endpoint, creates it when used for the first time.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker_config = Settings.get().config["restClient"]["circuitBreaker"]
+            breaker = CircuitBreaker(endpoint, breaker_config["failureThreshold"], breaker_config["resetTimeout"])
+            _breakers[endpoint] = breaker
+
+    return breaker
+
+
+def create_skipped_response(method: str, url: str, endpoint: str) -> requests.Response:
+    """
+    Returns response used instead of response of the skipped request.
+    """
+    response = requests.Response()
+    response.skipped_by_circuit_breaker = True
+    response.status_code = SKIPPED_STATUS_CODE
+    response.url = url
+    response.reason = "Circuit Open"
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps({
+        "error": {
+            "id": "circuitOpen",
+            "description": f"{method} request skipped, circuit breaker of {endpoint} is open",
+        }
+    }).encode("utf-8")
+    response._content_consumed = True
+    return response
+
+
+def is_skipped(response) -> bool:
+    """
+    Returns True if response was created instead of request skipped by circuit breaker.
+    """
+    return getattr(response, "skipped_by_circuit_breaker", False)
+
+
+_current_dataset: contextvars.ContextVar = contextvars.ContextVar("dataset", default=None)
+# datasets which requests were skipped since their processing started
+_incomplete_datasets: set = set()
+
+
+@contextlib.contextmanager
+def dataset_scope(path: Optional[str]):
+    """
+    Sets path of dataset, which requests are sent inside with statement, it is written to journal
+    when some of them is skipped.
+    """
+    with _journal_lock:
+        _incomplete_datasets.discard(path)
+    token = _current_dataset.set(path)
+    try:
+        yield path
+    finally:
+        _current_dataset.reset(token)
+
+
+def journal_skipped_request(method: str, url: str) -> None:
+    """
+    Marks currently processed dataset as incomplete and writes it to journal (once), so it is processed again
+    in the next scan. Url is not processed, so the journal does not contain any access tokens.
+    """
+    dataset_path = _current_dataset.get()
+    if dataset_path is None:
+        Logger.log(2, f"Skipped {method} {url} does not belong to any dataset, it is not written to journal")
+        return
+
+    journal_file = Settings.get().config["restClient"]["circuitBreaker"]["journalFile"]
+    with _journal_lock:
+        if dataset_path in _incomplete_datasets:
+            return
+        _incomplete_datasets.add(dataset_path)
+        if not journal_file:
+            return
+
+        entry = {"time": time.time(), "dataset": dataset_path, "method": method, "url": url}
+        with open(journal_file, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+    Logger.log(3, f"Dataset {dataset_path} written to journal {journal_file}, {method} {url} was skipped")
+
+
+def is_incomplete(path: str) -> bool:
+    """
+    Returns True if some request of the dataset was skipped during its current processing.
+    """
+    with _journal_lock:
+        return path in _incomplete_datasets
+
+
+def _load_journal() -> list:
+    """
+    Returns entries of journal and removes it.
+    """
+    journal_file = Settings.get().config["restClient"]["circuitBreaker"]["journalFile"]
+    if not journal_file or not os.path.isfile(journal_file):
+        return []
+
+    entries = []
+    with _journal_lock:
+        with open(journal_file, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    Logger.log(2, f"Invalid line in journal {journal_file}, skipping it")
+        os.remove(journal_file)
+
+    return entries
+
+
+def reprocess_skipped_datasets() -> None:
+    """
+    Removes datasets written to journal from state index, so they are processed in the following scan
+    even when their files did not change. Without state index every dataset is processed in each scan.
+    """
+    dataset_paths = {entry["dataset"] for entry in _load_journal() if entry.get("dataset")}
+    index = state_index.get_state_index()
+    if not dataset_paths or index is None:
+        return
+
+    for dataset_path in sorted(dataset_paths):
+        index.forget(dataset_path)
+    Logger.log(3, f"{len(dataset_paths)} datasets with requests skipped by circuit breaker will be processed again")
+
+
+def get_statistics() -> dict:
+    """
+    Returns state of circuit breakers in format
+    {endpoint: {"state": str, "times_opened": int, "skipped_requests": int}}
+    """
+    with _breakers_lock:
+        return {
+            endpoint: {
+                "state": breaker.state,
+                "times_opened": breaker.times_opened,
+                "skipped_requests": breaker.skipped_requests,
+            }
+            for endpoint, breaker in _breakers.items()
+        }
+
+
+def log_statistics() -> None:
+    for endpoint, statistics in get_statistics().items():
+        if statistics["times_opened"] == 0:
+            continue
+        Logger.log(2, f"Circuit breaker of {endpoint} is {statistics['state']}, opened "
+                      f"{statistics['times_opened']} times, {statistics['skipped_requests']} requests skipped")
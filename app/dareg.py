@@ -1,8 +1,8 @@
 import json
-import requests
 
 from utils import Logger
 from settings import Settings
+import request
 from request import response_print, debug_print
 
 
@@ -27,7 +27,7 @@ def register_dataset(space_id, name, path, invite_token=None, public_URL=None):
         "public_URL": public_URL,
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(data))
+    response = request.send("POST", url, request.DAREG_ENDPOINT, headers=headers, data=json.dumps(data))
     response_print(response)
 
 
@@ -46,7 +46,7 @@ def update_dataset(space_id, invite_token=None, public_URL=None):
     if public_URL:
         data["public_URL"] = public_URL
 
-    response = requests.patch(url, headers=headers, data=json.dumps(data))
+    response = request.send("PATCH", url, request.DAREG_ENDPOINT, headers=headers, data=json.dumps(data))
     response_print(response)
 
 
@@ -70,7 +70,7 @@ def log(space_id, type, message):
         "message": message,
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(data))
+    response = request.send("POST", url, request.DAREG_ENDPOINT, headers=headers, data=json.dumps(data))
     response_print(response)
 
 
@@ -80,7 +80,7 @@ def get_index() -> bytes:
     Get index only for checking if online.
     """
     url = Settings.get().config["dareg"]["host"]
-    response = requests.get(url)
+    response = request.send("GET", url, request.DAREG_ENDPOINT)
     Logger.log(5, response.text)
 
     response_print(response)
@@ -0,0 +1,96 @@
+"""
+Snapshot of files in dataset directory made by single os.scandir. It answers which trigger metadata file
+the dataset has and whether running file and separate metadata file exist without any other syscall.
+Snapshot can be used everywhere instead of os.DirEntry of the dataset directory, so one snapshot is shared
+by all functions processing the dataset. After fs2od creates or removes files, the snapshot has to be refreshed.
+"""
+import os
+from typing import Optional, Union
+import fs_stat
+from settings import Settings
+from utils import Logger
+
+
+class DatasetDirSnapshot:
+    def __init__(self, directory: os.DirEntry):
+        self.directory = directory
+        self.name = directory.name
+        self.path = directory.path
+        # name -> DirEntry of interesting regular files in the directory
+        self._files: dict = {}
+        self.refresh()
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"<DatasetDirSnapshot '{self.name}'>"
+
+    def inode(self) -> int:
+        return self.directory.inode()
+
+    def is_dir(self) -> bool:
+        return self.directory.is_dir()
+
+    def is_symlink(self) -> bool:
+        return self.directory.is_symlink()
+
+    def refresh(self) -> None:
+        """
+        Lists the directory again, only files which fs2od looks for are kept.
+        """
+        interesting_names = set(Settings.get().METADATA_FILES)
+        interesting_names.add(Settings.get().SEPARATE_METADATA_FILENAME)
+        interesting_names.add(Settings.get().config["continousFileImport"]["runningFileName"])
+
+        files = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if entry.name in interesting_names and fs_stat.is_file(entry):
+                        files[entry.name] = entry
+        except OSError as e:
+            Logger.log(4, f"Directory {self.path} can't be listed: {e}")
+        self._files = files
+
+    def get_trigger_file(self) -> str:
+        """
+        Returns path to the first metadata file (in order of configuration file) or empty string.
+        """
+        for file in Settings.get().METADATA_FILES:
+            if file in self._files:
+                return self._files[file].path
+        return ""
+
+    def has_running_file(self) -> bool:
+        return Settings.get().config["continousFileImport"]["runningFileName"] in self._files
+
+    def get_separate_metadata_file(self) -> str:
+        return os.path.join(self.path, Settings.get().SEPARATE_METADATA_FILENAME)
+
+    def has_separate_metadata_file(self) -> bool:
+        return Settings.get().SEPARATE_METADATA_FILENAME in self._files
+
+    def stat(self, file_path: str) -> Optional[os.stat_result]:
+        """
+        Returns stat of file in the directory or None if it does not exist.
+        """
+        entry = self._files.get(os.path.basename(file_path))
+        if entry is None:
+            return None
+        try:
+            return fs_stat.stat_entry(entry)
+        except OSError:
+            # removed after the directory was listed
+            return None
+
+
+def get_snapshot(directory: Union[os.DirEntry, DatasetDirSnapshot], refresh: bool = False) -> DatasetDirSnapshot:
+    """
+    Returns given snapshot (refreshed, if wanted) or a new snapshot of given directory.
+    """
+    if not isinstance(directory, DatasetDirSnapshot):
+        return DatasetDirSnapshot(directory)
+    if refresh:
+        directory.refresh()
+    return directory
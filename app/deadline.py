@@ -0,0 +1,67 @@
+"""
+Deadlines limit the time spent on processing of one dataset. The deadline is stored in context variable,
+so every request sent during processing of the dataset (even from thread pool of async_request) can use
+only the remaining time and processing is stopped when the deadline is exceeded.
+"""
+import contextlib
+import contextvars
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds: float, name: str = ""):
+        self.name = name
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Returns remaining time in seconds, 0 if deadline was exceeded.
+        """
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def is_exceeded(self) -> bool:
+        return self.remaining() == 0.0
+
+    def check(self) -> None:
+        """
+        Raises DeadlineExceeded if deadline was exceeded.
+        """
+        if self.is_exceeded():
+            raise DeadlineExceeded(f"Time limit of {self.seconds} s for {self.name} exceeded")
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+
+def get_current() -> Optional[Deadline]:
+    """
+    Returns deadline of currently processed dataset or None if there is no deadline.
+    """
+    return _current_deadline.get()
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """
+    Sets given deadline as current for the code inside with statement.
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def check_current() -> None:
+    """
+    Raises DeadlineExceeded if current deadline was exceeded.
+    """
+    current = get_current()
+    if current is not None:
+        current.check()
@@ -0,0 +1,168 @@
+"""
+Persistent cache of responses to GET requests validated by ETag and Last-Modified headers.
+Cached responses survive between runs (SQLite database), when the resource did not change,
+server returns 304 Not Modified without body and the stored body is used.
+The cache key contains hash of request headers, so responses are never shared between different access tokens.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+import requests
+import cassette
+from settings import Settings
+from utils import Logger
+
+
+class EtagCache:
+    def __init__(self, path: str, max_age: float):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        # statistics for each endpoint
+        self.statistics: dict = {}
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # cached bodies can contain private information, only owner can read the database
+            if not os.path.exists(self.path):
+                os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+            os.chmod(self.path, 0o600)
+
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "status_code INTEGER, headers TEXT, body BLOB, stored_at REAL)"
+            )
+            self._connection.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,))
+            self._connection.commit()
+
+        return self._connection
+
+    def _get_endpoint_statistics(self, endpoint: str) -> dict:
+        return self.statistics.setdefault(endpoint, {
+            "requests": 0, "not_modified": 0, "saved_bytes": 0, "received_bytes": 0, "decompressed_bytes": 0,
+        })
+
+    @staticmethod
+    def get_key(url: str, headers: dict) -> str:
+        headers_hash = hashlib.sha256(json.dumps(sorted(headers.items())).encode("utf-8")).hexdigest()
+        return f"{url} {headers_hash}"
+
+    def add_validators(self, key: str, headers: dict) -> dict:
+        """
+        Returns copy of headers with validators of stored response (If-None-Match, If-Modified-Since).
+        """
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        headers = dict(headers)
+        if row is None:
+            return headers
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def process_response(self, key: str, endpoint: str, response: requests.Response) -> requests.Response:
+        """
+        Returns stored response if server responded 304 Not Modified, otherwise stores response (if it has
+        validators) and returns it.
+        """
+        with self._lock:
+            statistics = self._get_endpoint_statistics(endpoint)
+            statistics["requests"] += 1
+
+            if response.status_code == 304:
+                row = self._get_connection().execute(
+                    "SELECT status_code, headers, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    statistics["not_modified"] += 1
+                    statistics["saved_bytes"] += len(row[2])
+                    return _create_cached_response(response, row[0], json.loads(row[1]), row[2])
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if response.ok and (etag or last_modified):
+                stored_headers = {"Content-Type": response.headers.get("Content-Type", "application/json")}
+                self._get_connection().execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, etag, last_modified, response.status_code, json.dumps(stored_headers), response.content,
+                     time.time())
+                )
+                self._get_connection().commit()
+
+        return response
+
+    def record_transfer(self, endpoint: str, response: requests.Response) -> None:
+        """
+        Records size of compressed and decompressed body of response.
+        """
+        if not response.headers.get("Content-Encoding") or "Content-Length" not in response.headers:
+            return
+
+        with self._lock:
+            statistics = self._get_endpoint_statistics(endpoint)
+            statistics["received_bytes"] += int(response.headers["Content-Length"])
+            statistics["decompressed_bytes"] += len(response.content)
+
+    def log_statistics(self) -> None:
+        with self._lock:
+            for endpoint, statistics in self.statistics.items():
+                if statistics["requests"]:
+                    Logger.log(3, f"ETag cache of {endpoint}: {statistics['not_modified']} of "
+                                  f"{statistics['requests']} GET requests not modified "
+                                  f"(hit ratio {statistics['not_modified'] / statistics['requests']:.1%}), "
+                                  f"{statistics['saved_bytes']} bytes not downloaded")
+                if statistics["decompressed_bytes"]:
+                    Logger.log(3, f"Compression of {endpoint}: {statistics['received_bytes']} bytes received for "
+                                  f"{statistics['decompressed_bytes']} bytes of responses, "
+                                  f"{statistics['decompressed_bytes'] - statistics['received_bytes']} bytes saved")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _create_cached_response(not_modified_response: requests.Response, status_code: int, headers: dict,
+                            body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = not_modified_response.url
+    response.request = not_modified_response.request
+    response.headers.update(headers)
+    response._content = body
+    response._content_consumed = True
+    response.from_etag_cache = True
+    return response
+
+
+_etag_cache: Optional[EtagCache] = None
+_etag_cache_lock = threading.Lock()
+
+
+def get_etag_cache() -> Optional[EtagCache]:
+    """
+    Returns ETag cache or None if it is disabled in configuration file.
+    Cache is not used when requests are recorded or replayed, the traffic would depend on content of the cache.
+    """
+    global _etag_cache
+    cache_config = Settings.get().config["restClient"]["etagCache"]
+    if not cache_config["enabled"] or cassette.get_mode() != cassette.MODE_OFF:
+        return None
+
+    with _etag_cache_lock:
+        if _etag_cache is None:
+            _etag_cache = EtagCache(cache_config["path"], cache_config["maxAge"] * 24 * 3600)
+
+    return _etag_cache
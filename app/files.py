@@ -1,5 +1,8 @@
+import asyncio
 import json
+from typing import Iterator
 import request
+import async_request
 from settings import Settings
 from utils import Logger
 
@@ -16,6 +19,16 @@ def get_file_attributes(file_id):
     return response.json()
 
 
+async def get_file_attributes_async(file_id):
+    """
+    Asyncio variant of get_file_attributes()
+    """
+    Logger.log(5, "get_file_attributes_async(%s):" % file_id)
+    url = "oneprovider/data/" + file_id
+    response = await async_request.get(url)
+    return response.json()
+
+
 def set_file_attribute(file_id, posix_mode) -> bool:
     """
     Set attributes to directory or file with given file_id. Only POSIX mode can be set up.
@@ -29,12 +42,28 @@ def set_file_attribute(file_id, posix_mode) -> bool:
     return response.ok
 
 
+async def set_file_attribute_async(file_id, posix_mode) -> bool:
+    """
+    Asyncio variant of set_file_attribute()
+    """
+    Logger.log(5, "set_file_attribute_async(%s, %s):" % (file_id, posix_mode))
+    url = "oneprovider/data/" + file_id
+    data = {"mode": posix_mode}
+    headers = dict({"Content-type": "application/json"})
+    response = await async_request.put(url, headers=headers, data=json.dumps(data))
+    return response.ok
+
+
 def set_file_attribute_recursive(file_id: str, posix_mode: str, except_root: bool = False) -> bool:
     """
     Set attributes to directory or file with given file_id. Only POSIX mode can be set up.
     In case of directory attributes is set to all children.
     Returns True if everything was successful, otherwise False
+    When asyncio transport is selected, whole tree is walked concurrently
     """
+    if async_request.is_enabled():
+        return async_request.run(set_file_attribute_recursive_async(file_id, posix_mode, except_root=except_root))
+
     Logger.log(5, "setFileAttributeRecursive(%s, %s):" % (file_id, posix_mode))
     attributes = get_file_attributes(file_id)
     successful = True
@@ -51,9 +80,8 @@ def set_file_attribute_recursive(file_id: str, posix_mode: str, except_root: boo
             # set attribute to directory itself
             successful = set_file_attribute(file_id, posix_mode) and successful
 
-        # set attribute to childs
-        directory = list_directory(file_id)
-        for node in directory["children"]:
+        # set attribute to childs, listing is streamed, so large directories are not held in memory
+        for node in iter_directory_children(file_id):
             # recursive set up attributes to all files in directory
             successful = set_file_attribute_recursive(node["file_id"], posix_mode, except_root=False) and successful
     else:
@@ -65,6 +93,66 @@ def set_file_attribute_recursive(file_id: str, posix_mode: str, except_root: boo
     return successful
 
 
+async def set_file_attribute_recursive_async(file_id: str, posix_mode: str, except_root: bool = False) -> bool:
+    """
+    Asyncio variant of set_file_attribute_recursive(). Nodes of the tree are processed concurrently
+    by a fixed number of workers, so number of coroutines does not grow with size of the tree.
+    """
+    Logger.log(5, "set_file_attribute_recursive_async(%s, %s):" % (file_id, posix_mode))
+    queue = asyncio.Queue()
+    queue.put_nowait((file_id, except_root))
+    results = []
+    errors = []
+
+    async def worker():
+        while True:
+            node_id, node_except_root = await queue.get()
+            try:
+                if not errors:
+                    results.append(await _set_node_attribute_async(node_id, posix_mode, node_except_root, queue))
+            except Exception as e:
+                # the rest of queue is drained without processing, error is raised after the walk
+                errors.append(e)
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(async_request.get_max_concurrency())]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    if errors:
+        raise errors[0]
+    return all(results)
+
+
+async def _set_node_attribute_async(file_id: str, posix_mode: str, except_root: bool, queue: asyncio.Queue) -> bool:
+    """
+    Sets attributes to one node of the tree, children of directory are put to the queue.
+    """
+    attributes = await get_file_attributes_async(file_id)
+
+    if "type" not in attributes or "mode" not in attributes:
+        # in case there is no file in space
+        return True
+
+    if attributes["type"].lower() == "dir":
+        # node is directory
+        for child_id in await list_directory_children_ids_async(file_id):
+            queue.put_nowait((child_id, False))
+
+        if except_root:
+            return True
+
+    if attributes["mode"] != posix_mode:
+        # desired posix_mode is different from the actual mode
+        return await set_file_attribute_async(file_id, posix_mode)
+    return True
+
+
 def list_directory(file_id):
     """
     List directory. Subdirectories and files are accesible in response['children'].
@@ -78,6 +166,40 @@ def list_directory(file_id):
     return response.json()
 
 
+def iter_directory_children(file_id: str, oneprovider_index: int = 0) -> Iterator[dict]:
+    """
+    Streaming variant of list_directory(), yields children of directory one by one as they are received.
+    Following pages of listing are requested when needed.
+    """
+    Logger.log(5, f"iter_directory_children({file_id}):")
+    url = "oneprovider/data/" + file_id + "/children"
+    page_url = url
+    while True:
+        other_fields = dict()
+        yield from request.iter_json_array(
+            page_url, key="children", oneprovider_index=oneprovider_index, other_fields=other_fields
+        )
+
+        if other_fields.get("isLast", True) or not other_fields.get("nextPageToken"):
+            return
+        page_url = url + "?token=" + other_fields["nextPageToken"]
+
+
+async def list_directory_children_ids_async(file_id: str, oneprovider_index: int = 0) -> list:
+    """
+    Asyncio variant of iter_directory_children(), returns only ids of children.
+    Listing is streamed in thread pool, so just the ids are held in memory.
+    """
+    Logger.log(5, "list_directory_children_ids_async(%s):" % file_id)
+    url = "oneprovider/data/" + file_id + "/children"
+
+    def iter_ids():
+        for node in iter_directory_children(file_id, oneprovider_index=oneprovider_index):
+            yield node["file_id"]
+
+    return await async_request.collect(url, iter_ids, oneprovider_index=oneprovider_index)
+
+
 def downloadFileContent(file_id):
     """
     Download file conntent as binary string (application/octet-stream).
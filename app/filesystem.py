@@ -1,16 +1,36 @@
+import collections
 import datetime
+import functools
+import re
 import shutil
 import os
+import stat
+import threading
 import time
-from typing import Any, Union, Optional, Tuple
-import ruamel.yaml
+import uuid
+from typing import Any, Union, Optional, Tuple, Iterator
 from settings import Settings
 from utils import Logger, Utils
 import spaces
 import workflow
 import support
+import rate_limiter
+import circuit_breaker
+import dataset_dir
+import deadline
+import fs_stat
+import state_index
+import yaml_cache
+import yaml_engine
 import fnmatch
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# suffix of temporary files used for atomic writes of metadata files, watch mode ignores renames of them
+TEMPORARY_FILE_SUFFIX = ".fs2od-tmp"
+
+# paths of files removed by fs2od, watch mode does not take their removal as a change of dataset
+_own_removals: set = set()
+_own_removals_lock = threading.Lock()
 
 
 def scan_watched_directories(only_check: bool = False) -> None:
@@ -27,45 +47,75 @@ def scan_watched_directories(only_check: bool = False) -> None:
             _scanWatchedDirectory(directory, only_check)
 
 
-def traverse_through_directories_wrapper(regex_like_path: str) -> list:
+def traverse_through_directories_wrapper(regex_like_path: str) -> Iterator[str]:
     """
-    This function is only wrapper (helper function) for traverse_through_directories_wrapper().
-    It prepares path for this function
+    This function is only wrapper (helper function) for traverse_through_directories().
+    It prepares path for this function (splits it to static prefix and compiled patterns of the rest).
     """
     Logger.log(3, f"traverse_through_directories_wrapper(regex_like_path={regex_like_path})")
-    # do not want empty filenames
-    regex_like_path = regex_like_path.rstrip(os.sep)
-    # one special occasion, the root (/) itself
-    if not regex_like_path:
-        regex_like_path = os.sep
+    start_path, segments = _compile_path_pattern(regex_like_path)
+    if not fs_stat.path_is_dir(start_path):
+        Logger.log(4, f"Directory {start_path} does not exist, nothing matches {regex_like_path}")
+        return iter(())
+
+    return traverse_through_directories(start_path, segments)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_path_pattern(regex_like_path: str) -> Tuple[str, tuple]:
+    """
+    Returns static prefix of the path (without any wildcard) and tuple of remaining segments. Segments with
+    wildcards are compiled regular expressions, other segments stay strings (they are not searched for).
+    """
+    absolute = regex_like_path.startswith(os.sep)
+    parts = [part for part in regex_like_path.split(os.sep) if part]
+
+    static_parts = []
+    while parts and not _has_wildcard(parts[0]):
+        static_parts.append(parts.pop(0))
+
+    start_path = os.path.join(os.sep if absolute else os.curdir, *static_parts)
+    segments = tuple(re.compile(fnmatch.translate(part)) if _has_wildcard(part) else part for part in parts)
+    return start_path, segments
 
-    path_list = os.path.split(regex_like_path)
 
-    return traverse_through_directories(path_list)
+def _has_wildcard(path_segment: str) -> bool:
+    return any(character in path_segment for character in "*?[")
 
 
-def traverse_through_directories(path_list: tuple) -> list:
+def traverse_through_directories(start_path: str, segments: tuple) -> Iterator[str]:
     """
-    Traverses through directories and returns directories (only directories) satisfying the pattern given in config file
-    If there is no directory which satisfies pattern, returns empty list
-    Warning: this function is recursive. For the folders depth higher than sys.getrecursionlimit()
-    it is needed to change recursion limit using sys.setrecursionlimit(new_limit)
+    Yields directories (only directories) under start_path satisfying the pattern given in config file,
+    each one as soon as it is found. Walks iteratively in depth-first order, only directories matching
+    the already processed segments are listed.
     """
-    Logger.log(5, f"traverse_through_directories(path_list={path_list})")
-    # os.sep representing root (/)
-    paths = [os.sep]
-    if path_list[0] != os.sep:
-        paths = traverse_through_directories(os.path.split(path_list[0]))
+    Logger.log(5, f"traverse_through_directories(start_path={start_path},segments={segments})")
+    stack = [(start_path, 0)]
+    while stack:
+        path, segment_index = stack.pop()
+        if segment_index == len(segments):
+            yield path
+            continue
 
-    new_paths = []
-    for path in paths:
-        regex_name = path_list[1]
+        segment = segments[segment_index]
+        if isinstance(segment, str):
+            # name without wildcard, no need to list the whole directory
+            child_path = os.path.join(path, segment)
+            if fs_stat.path_is_dir(child_path):
+                stack.append((child_path, segment_index + 1))
+            continue
 
-        for dirent in os.scandir(path):
-            if fnmatch.fnmatch(dirent.name, regex_name) and os.path.isdir(dirent.path):
-                new_paths.append(dirent.path)
+        children = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if segment.match(entry.name) and fs_stat.is_dir(entry):
+                        children.append(entry.path)
+        except OSError as e:
+            Logger.log(2, f"Directory {path} can't be listed: {e}")
 
-    return new_paths
+        # reversed, so directories are yielded in order of listing
+        stack.extend((child_path, segment_index + 1) for child_path in reversed(children))
 
 
 def _process_denied_providers(space_id: str, yaml_file_path: str, directory: os.DirEntry) -> bool:
@@ -89,23 +139,53 @@ def _process_denied_providers(space_id: str, yaml_file_path: str, directory: os.
 
 
 def _process_possible_space(directory: os.DirEntry, only_check: bool) -> bool:
+    """
+    Processes the directory within time limit for one dataset. If the limit is exceeded,
+    processing is stopped and the directory is processed again in the next run.
+    """
+    deadline_seconds = Settings.get().config["restClient"]["timeout"]["datasetDeadline"]
+    dataset_deadline = deadline.Deadline(deadline_seconds, name=f"dataset {directory.name}") if deadline_seconds \
+        else None
+
+    try:
+        # requests of existing datasets (continuous import, space size, permissions, transfers) are maintenance,
+        # only requests sent by workflow.register_space for a new dataset are raised to registration
+        with deadline.deadline_scope(dataset_deadline), circuit_breaker.dataset_scope(directory.path), \
+                rate_limiter.priority_scope(rate_limiter.PRIORITY_MAINTENANCE):
+            return _process_possible_space_within_deadline(directory, only_check)
+    except deadline.DeadlineExceeded as e:
+        Logger.log(2, f"{e}, processing of {directory.path} stopped, it will be processed again in the next run")
+        return False
+
+
+def _process_possible_space_within_deadline(directory: os.DirEntry, only_check: bool) -> bool:
     Logger.log(4, f"_process_possible_space(dir={directory.path},only_check={only_check}):")
+    # one listing of the directory is shared by all functions processing the dataset
+    directory = dataset_dir.get_snapshot(directory)
     # test if directory contains a yaml file
     yml_trigger_file = get_trigger_metadata_file(directory)
     if not yml_trigger_file:
         Logger.log(4, f"Not processing directory {directory.name} (not contains yaml).")
         return False
 
+    index = state_index.get_state_index()
+    fingerprint = state_index.get_fingerprint(directory, yml_trigger_file) if index is not None else None
+    if index is not None and index.is_unchanged(directory.path, fingerprint):
+        Logger.log(4, f"Not processing directory {directory.name} (not changed since last check).")
+        return True
+
     yml_access_info_file = get_access_info_storage_file(directory, yml_trigger_file)
-    create_file_if_does_not_exist(yml_access_info_file)
+    if create_file_if_does_not_exist(yml_access_info_file):
+        directory.refresh()
 
-    yml_metadata_file = os.path.join(directory.path, Settings.get().SEPARATE_METADATA_FILENAME)
-    if os.path.exists(yml_metadata_file):
+    yml_metadata_file = directory.get_separate_metadata_file()
+    if directory.has_separate_metadata_file():
         yml_metadata_content = load_yaml(yml_metadata_file)
         removing_time = get_token_from_yaml(yml_metadata_content, "removingTime", error_message_importance=4)
 
         if removing_time == "removed":
             Logger.log(4, f"Not processing directory {directory.name} (support already revoked).")
+            _record_processed_dataset(directory, yml_trigger_file, removal_state="removed")
             return False
 
     yml_content = load_yaml(yml_access_info_file)
@@ -133,7 +213,8 @@ def _process_possible_space(directory: os.DirEntry, only_check: bool) -> bool:
             # if no status, enough info was provided by registerSpace, not logging more
             return False
 
-        # after creating space, asking for information one more time
+        # after creating space (and its files), asking for information one more time
+        directory.refresh()
         yml_content = load_yaml(yml_trigger_file)
         space_id = yamlContainsSpaceId(yml_content)
 
@@ -145,7 +226,7 @@ def _process_possible_space(directory: os.DirEntry, only_check: bool) -> bool:
 
     # set continous file import on all spaces
     # TODO, #5 - when config['continousFileImport']['enabled'] is set to False, all import should be stopped
-    time.sleep(1 * Settings.get().config["sleepFactor"])
+    rate_limiter.sleep_for_backpressure(1)
     if Settings.get().config["continousFileImport"]["enabled"]:
         _auto_set_continuous_import(space_id, directory)
     else:
@@ -153,9 +234,10 @@ def _process_possible_space(directory: os.DirEntry, only_check: bool) -> bool:
 
     if not Settings.get().USE_SEPARATE_METADATA_FILE:
         # not using metadata file so can skip next lines
+        _record_processed_dataset(directory, yml_trigger_file, space_id=space_id)
         return True
 
-    if not os.path.exists(yml_metadata_file):
+    if not directory.has_separate_metadata_file():
         Logger.log(4, f"Not checking for removal of {directory.name} (not contains metadata file).")
         return False
 
@@ -168,16 +250,63 @@ def _process_possible_space(directory: os.DirEntry, only_check: bool) -> bool:
     _process_denied_providers(space_id, yml_metadata_file, directory)
 
     yaml_dict = load_yaml(yml_metadata_file)
-    setValueToYaml(
-        file_path=yml_metadata_file,
-        yaml_dict=yaml_dict,
-        valueType="LastProgramRun",
-        value=datetime.datetime.now().isoformat()
-    )
+    last_program_run = datetime.datetime.now()
+    if _is_last_program_run_outdated(yaml_dict, last_program_run):
+        setValueToYaml(
+            file_path=yml_metadata_file,
+            yaml_dict=yaml_dict,
+            valueType="LastProgramRun",
+            value=last_program_run.isoformat()
+        )
+
+    removing_time = get_token_from_yaml(yaml_dict, "removingTime", None, error_message_importance=4)
+    denied_providers = get_token_from_yaml(yaml_dict, "deniedProviders", default_value=None, error_message_importance=4)
+    if removing_time != "removed" and not (denied_providers and "primary" in denied_providers):
+        # removal was not requested or it was cancelled
+        removing_time = None
+    _record_processed_dataset(directory, yml_trigger_file, space_id=space_id,
+                              removal_state=str(removing_time) if removing_time else "",
+                              last_program_run=last_program_run.isoformat())
 
     return True
 
 
+def _is_last_program_run_outdated(yaml_dict: dict, now: datetime.datetime) -> bool:
+    """
+    Returns True if LastProgramRun in metadata file is older than lastProgramRunInterval (or missing),
+    so it has to be written. Exact time of the last run is kept in state index.
+    """
+    last_program_run = get_token_from_yaml(yaml_dict, "lastProgramRun", None, error_message_importance=4)
+    try:
+        if not isinstance(last_program_run, datetime.datetime):
+            last_program_run = datetime.datetime.fromisoformat(last_program_run)
+        age = (now - last_program_run).total_seconds()
+    except (TypeError, ValueError):
+        return True
+
+    interval = Settings.get().config["fs2odMetadataFile"]["lastProgramRunInterval"]
+    return not 0 <= age < interval * 3600
+
+
+def _record_processed_dataset(directory: os.DirEntry, yml_trigger_file: str, **state) -> None:
+    """
+    Stores current fingerprint and state of successfully processed dataset to state index (if enabled).
+    """
+    index = state_index.get_state_index()
+    if index is None:
+        return
+
+    if circuit_breaker.is_incomplete(directory.path):
+        # some checks were skipped by circuit breaker, dataset must not be skipped as unchanged in the next scan
+        Logger.log(4, f"Dataset {directory.path} not marked as checked, some of its requests were skipped")
+        index.forget(directory.path)
+        index.update(directory.path, **state)
+        return
+
+    snapshot = dataset_dir.get_snapshot(directory, refresh=True)
+    index.update(directory.path, state_index.get_fingerprint(snapshot, yml_trigger_file), **state)
+
+
 def _scanWatchedDirectory(base_path: str, only_check: bool) -> None:
     """
     Scan if directory contains subdirectories which can be processed
@@ -185,20 +314,90 @@ def _scanWatchedDirectory(base_path: str, only_check: bool) -> None:
     Logger.log(4, "_scanWatchedDirectory(%s):" % base_path)
     Logger.log(3, "Start processing path %s" % base_path)
 
-    if not os.path.isdir(base_path):
+    if not fs_stat.path_is_dir(base_path):
         Logger.log(1, "Directory %s can't be processed, it doesn't exist." % base_path)
         return
 
-    directory_items = os.scandir(path=base_path)
+    directory_items = list(_get_possible_spaces(os.scandir(path=base_path)))
+    _process_possible_spaces(directory_items, only_check)
+
+    index = state_index.get_state_index()
+    if index is not None:
+        index.forget_missing(base_path, {directory_item.path for directory_item in directory_items})
+
+    Logger.log(3, "Finish processing path %s" % base_path)
+
+
+def _get_possible_spaces(directory_items):
+    """
+    Yields directories from given items of scanned directory.
+    """
     for directory_item in directory_items:
         #  checks if this item is a directory or file, if it is file , not interesting for us
-        if not os.path.isdir(directory_item):
+        if not fs_stat.is_dir(directory_item):
             Logger.log(4, f"Skipping item, because it is a file {directory_item.path}")
             continue
 
-        _process_possible_space(directory_item, only_check)
+        yield directory_item
 
-    Logger.log(3, "Finish processing path %s" % base_path)
+
+def process_datasets(paths: list, only_check: bool = False) -> None:
+    """
+    Processes only datasets in given directories (e.g. changed datasets found by watch mode).
+    Directories which do not exist anymore are skipped.
+    """
+    Logger.log(4, f"process_datasets(paths={paths},only_check={only_check}):")
+    paths_by_parent = {}
+    for path in paths:
+        parent, name = os.path.split(path)
+        paths_by_parent.setdefault(parent, set()).add(name)
+
+    directory_items = []
+    for parent, names in paths_by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                directory_items.extend(_get_possible_spaces(entry for entry in entries if entry.name in names))
+        except OSError as e:
+            Logger.log(2, f"Directory {parent} can't be processed: {e}")
+
+    _process_possible_spaces(directory_items, only_check)
+
+
+def _process_possible_spaces(directory_items: list, only_check: bool) -> None:
+    workers = Settings.get().config["datasetProcessing"]["workers"]
+    if workers <= 1:
+        for directory_item in directory_items:
+            _process_possible_space(directory_item, only_check)
+    else:
+        _process_possible_spaces_concurrently(directory_items, only_check, workers)
+
+
+def _process_possible_spaces_concurrently(directory_items, only_check: bool, workers: int) -> None:
+    """
+    Processes directories by pool of workers. Output of each directory is buffered and printed
+    in order of directories, at most workers * 2 directories are waiting for printing.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dataset_worker") as executor:
+        pending = collections.deque()
+        for directory_item in directory_items:
+            pending.append(executor.submit(_process_possible_space_buffered, directory_item, only_check))
+            if len(pending) >= workers * 2:
+                print(pending.popleft().result(), end="", flush=True)
+
+        while pending:
+            print(pending.popleft().result(), end="", flush=True)
+
+
+def _process_possible_space_buffered(directory: os.DirEntry, only_check: bool) -> str:
+    """
+    Processes the directory in worker thread, returns its log. Failure of one directory does not stop the others.
+    """
+    with Logger.buffered() as output:
+        try:
+            _process_possible_space(directory, only_check)
+        except Exception as e:
+            Logger.log(1, f"Processing of {directory.path} failed: {e!r}")
+    return output.getvalue()
 
 
 def get_trigger_metadata_file(directory: os.DirEntry) -> str:
@@ -208,17 +407,10 @@ def get_trigger_metadata_file(directory: os.DirEntry) -> str:
     """
     Logger.log(4, f"get_metadata_file({directory.path})")
 
-    for file in Settings.get().METADATA_FILES:
-        metadata_file = os.path.join(directory, file)
-
-        # check if given metadata file exists in directory
-        if os.path.isfile(metadata_file):
-            # check if a metadata file has been already found
-            return metadata_file
-
-    # no metadata file found
-    Logger.log(4, "No file with metadata found in %s " % directory.path)
-    return ""
+    metadata_file = dataset_dir.get_snapshot(directory).get_trigger_file()
+    if not metadata_file:
+        Logger.log(4, "No file with metadata found in %s " % directory.path)
+    return metadata_file
 
 
 def get_access_info_storage_file(directory: os.DirEntry, metadata_trigger_name: Optional[str]):
@@ -239,13 +431,8 @@ def get_access_info_storage_file(directory: os.DirEntry, metadata_trigger_name:
 
 def _auto_set_continuous_import(space_id: str, directory: os.DirEntry):
     Logger.log(4, f"_auto_set_continuous_import(space_id={space_id},dir={directory.path}):")
-    running_file = (
-        directory.path
-        + os.sep
-        + Settings.get().config["continousFileImport"]["runningFileName"]
-    )
     # test if directory contains running file
-    if os.path.isfile(running_file):
+    if dataset_dir.get_snapshot(directory).has_running_file():
         spaces.enableContinuousImport(space_id)
     else:
         spaces.disableContinuousImport(space_id, directory)
@@ -254,10 +441,11 @@ def _auto_set_continuous_import(space_id: str, directory: os.DirEntry):
 def setup_continuous_import(directory: os.DirEntry):
     Logger.log(4, f"setup_continuous_import({directory.path}):")
     # TODO, #6 - to be replaced by walk through files in Onedata instead of in POSIX
-    if not directory.is_dir():
+    if not fs_stat.is_dir(directory):
         Logger.log(4, f"Directory with path {directory.path} does not exist")
         return
 
+    directory = dataset_dir.get_snapshot(directory)
     # test if directory contains a yaml file
     yml_trigger_file = get_trigger_metadata_file(directory)
     if not yml_trigger_file:
@@ -300,7 +488,7 @@ def create_file_if_does_not_exist(file_path: str) -> bool:
     Returns True if new file was created, on errors and existing files returns False.
     """
     Logger.log(4, f"create_file_if_does_not_exist(path={file_path})")
-    if os.path.exists(file_path):
+    if fs_stat.path_exists(file_path):
         return False
 
     return create_file(file_path)
@@ -314,7 +502,7 @@ def create_file(file_path: str) -> bool:
     """
     Logger.log(4, f"create_file(path={file_path})")
     try:
-        open(file_path, "w").close()
+        write_file_if_changed(file_path, "")
     except OSError as e:
         Logger.log(1, f"File {file_path} could not be created. Error: {e}")
         return False
@@ -322,6 +510,97 @@ def create_file(file_path: str) -> bool:
     return True
 
 
+def write_file_if_changed(file_path: str, content: str) -> bool:
+    """
+    Writes content to file unless the file already contains exactly this content, so unchanged files keep
+    their modification time and Onedata import does not see them as modified.
+    Returns True if the file was written. Raises OSError.
+    """
+    data = content.encode("UTF-8")
+    try:
+        with open(file_path, "rb") as f:
+            # one byte more than needed is enough to find out that the file is longer
+            unchanged = f.read(len(data) + 1) == data
+    except FileNotFoundError:
+        unchanged = False
+
+    fs_stat.count_write(skipped=unchanged)
+    if unchanged:
+        Logger.log(4, f"File {file_path} not written, its content is unchanged")
+        return False
+
+    yaml_cache.invalidate(file_path)
+    _replace_file(file_path, data)
+    return True
+
+
+def _replace_file(file_path: str, data: bytes) -> None:
+    """
+    Writes data to a temporary file in the same directory and renames it over the file, so readers see either
+    the old or the new content. Mode and owner of the replaced file are kept.
+    """
+    try:
+        file_stat = os.lstat(file_path)
+    except FileNotFoundError:
+        file_stat = None
+
+    if file_stat is not None and stat.S_ISLNK(file_stat.st_mode):
+        # rename would replace the link itself, target of the link is rewritten in place
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return
+
+    directory, name = os.path.split(file_path)
+    temporary_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}{TEMPORARY_FILE_SUFFIX}")
+    # new file gets the same mode as a file created by open(), i.e. according to umask
+    fd = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if file_stat is not None:
+                os.fchmod(f.fileno(), stat.S_IMODE(file_stat.st_mode))
+                temporary_stat = os.fstat(f.fileno())
+                if (temporary_stat.st_uid, temporary_stat.st_gid) != (file_stat.st_uid, file_stat.st_gid):
+                    try:
+                        os.fchown(f.fileno(), file_stat.st_uid, file_stat.st_gid)
+                    except PermissionError:
+                        Logger.log(4, f"Owner of file {file_path} can't be kept, it is owned by fs2od user now")
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+
+def remove_file(file_path: str) -> None:
+    """
+    Removes file, removal is remembered for watch mode. Raises OSError.
+    """
+    file_path = os.path.normpath(file_path)
+    with _own_removals_lock:
+        _own_removals.add(file_path)
+    try:
+        os.remove(file_path)
+    except OSError:
+        with _own_removals_lock:
+            _own_removals.discard(file_path)
+        raise
+
+
+def is_own_removal(file_path: str) -> bool:
+    """
+    Returns True (only once) if the file was removed by fs2od.
+    """
+    file_path = os.path.normpath(file_path)
+    with _own_removals_lock:
+        if file_path in _own_removals:
+            _own_removals.discard(file_path)
+            return True
+    return False
+
+
 def append_to_file(file_path: str, line: str) -> bool:
     """
     Tries to append to file with a specified by filename.
@@ -329,6 +608,7 @@ def append_to_file(file_path: str, line: str) -> bool:
     Possible error: insufficient rights
     """
     Logger.log(4, f"append_to_file(path={file_path},line={line})")
+    yaml_cache.invalidate(file_path)
     try:
         f = open(file_path, "a")
     except OSError as e:
@@ -350,7 +630,7 @@ def load_file_contents(file_path: str, binary_mode: bool = False) -> Union[bytes
     """
     Logger.log(4, f"load_file_contents(path={file_path})")
 
-    if not os.path.exists(file_path):
+    if not fs_stat.path_exists(file_path):
         Logger.log(1, f"File {file_path} doesn't exist.")
         return None
 
@@ -404,15 +684,28 @@ def load_yaml(file_path: str) -> Optional[dict]:
     If the file is not in the correct YAML format, returns None.
     """
     Logger.log(4, f"load_yaml(path={file_path})")
+    cache = yaml_cache.get_yaml_cache()
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.get_key(fs_stat.stat(file_path))
+        except OSError:
+            # error is logged by load_file_contents()
+            pass
+        else:
+            configuration = cache.get(file_path, cache_key)
+            if configuration is not None:
+                return configuration
+
     stream = load_file_contents(file_path, binary_mode=True)
 
     # there is no need for log, log is done in load_file_contents() function
     if stream is None:
         return None
 
-    yaml = ruamel.yaml.YAML(typ="safe")
+    parse_start = time.perf_counter()
     try:
-        configuration = yaml.load(stream)
+        configuration = yaml_engine.load(stream)
     except Exception as e:
         Logger.log(2, f"File with path {file_path} is not in valid YAML format. Error: {e}")
         return None
@@ -421,6 +714,9 @@ def load_yaml(file_path: str) -> Optional[dict]:
     if not configuration:
         configuration = dict()
 
+    if cache_key is not None:
+        cache.put(file_path, cache_key, configuration, time.perf_counter() - parse_start)
+
     Logger.log(5, "Configuration:", pretty_print=configuration)
 
     return configuration
@@ -446,27 +742,11 @@ def convert_dict_to_yaml(dictionary: dict) -> str:
     On error returns empty string
     """
     Logger.log(4, f"convert_dict_to_yaml()")
-    # store new yaml file
-    ryaml = ruamel.yaml.YAML()
-    ryaml.width = (
-        200  # count of characters on a line, if there is more chars, line is broken
-    )
-    ryaml.indent(sequence=4, offset=2)
-    with tempfile.TemporaryFile("w+", encoding="UTF-8") as temp_file:
-        # this function behaves the best when writing right to file
-        ryaml.dump(dictionary, temp_file)
-        # must be sure that changes are written to temporary file
-        temp_file.flush()
-        # now, pointer to file is on position after last written character, must set it to first position in file
-        temp_file.seek(0)
-        # now we are reading what we have written
-        yaml_string = temp_file.read()
-
-    return yaml_string
+    return yaml_engine.dump(dictionary)
 
 
 def setValueToYaml(file_path, yaml_dict, valueType, value):
-    if os.path.exists(file_path):
+    if fs_stat.path_exists(file_path):
         if yaml_dict.get(Settings.get().config["metadataFileTags"]["onedata"]) == None:
             yaml_dict[Settings.get().config["metadataFileTags"]["onedata"]] = dict()
 
@@ -496,9 +776,7 @@ def setValueToYaml(file_path, yaml_dict, valueType, value):
                 Settings.get().config["metadataFileTags"]["lastProgramRun"]
             ] = value
 
-        # open yaml file
-        with open(file_path, "w") as f:
-            f.write(convert_dict_to_yaml(yaml_dict))
+        write_file_if_changed(file_path, convert_dict_to_yaml(yaml_dict))
     else:
         Logger.log(1, "Metadata file %s doesn't exists." % file_path)
 
@@ -509,7 +787,7 @@ def set_values_to_yaml(file_path: str, yaml_dict: dict, new_values_dict: dict) -
     Returns True if successful, otherwise False.
     Possible errors: metadata file does not exist, cannot write to metadata file, unexpected error
     """
-    if not os.path.exists(file_path):
+    if not fs_stat.path_exists(file_path):
         Logger.log(1, f"Metadata file {file_path} doesn't exist.")
         return False
 
@@ -524,14 +802,8 @@ def set_values_to_yaml(file_path: str, yaml_dict: dict, new_values_dict: dict) -
     # Solving bad indentation of list
     # https://stackoverflow.com/questions/25108581/python-yaml-dump-bad-indentation
     # yaml.safe_dump(yaml_dict, f, sort_keys=False)
-    ryaml = ruamel.yaml.YAML()
-    ryaml.width = 200  # count of characters on a line, if there is more chars, line is breaked
-    ryaml.indent(sequence=4, offset=2)
-
     try:
-        # open yaml file
-        with open(file_path, "w") as f:
-            ryaml.dump(yaml_dict, f)
+        write_file_if_changed(file_path, yaml_engine.dump(yaml_dict))
     except OSError as e:
         Logger.log(1, f"Metadata file {file_path} cannot be opened. Error: {e}")
         return False
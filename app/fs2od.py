@@ -4,9 +4,17 @@ import argparse
 import sys
 from settings import Settings
 import filesystem
+import fs_stat
 import test
 import sandbox
 import actions_log
+import circuit_breaker
+import request
+import response_cache
+import request_metrics
+import state_index
+import watcher
+import yaml_cache
 
 
 def runScan(args):
@@ -14,15 +22,52 @@ def runScan(args):
         result = test.testConnection(of_each_oneprovider=False)
         if result:
             sys.exit(1)
+    else:
+        request.prewarm_connections()
 
     # after successful connection there is need to check some forgotten log
-    actions_log.get_actions_logger().new_actions_log()
-    actions_log.get_actions_logger().finish_actions_log()
+    actions_log.rollback_unfinished_logs()
 
     if args.no_metadata_usage:
         Settings.get().USE_METADATA_FILE = False
 
+    if args.full_scan:
+        Settings.get().config["stateIndex"]["recheckInterval"] = 0
+
+    circuit_breaker.reprocess_skipped_datasets()
+    response_cache.get_response_cache().start()
     filesystem.scan_watched_directories()
+    response_cache.get_response_cache().stop()
+
+    request.log_statistics()
+    request_metrics.write_reports()
+    fs_stat.log_statistics()
+    if yaml_cache.get_yaml_cache() is not None:
+        yaml_cache.get_yaml_cache().log_statistics()
+    if state_index.get_state_index() is not None:
+        state_index.get_state_index().log_statistics()
+        state_index.get_state_index().close()
+
+
+def runWatch(args):
+    if not args.no_test_connection:
+        result = test.testConnection(of_each_oneprovider=False)
+        if result:
+            sys.exit(1)
+    else:
+        request.prewarm_connections()
+
+    actions_log.rollback_unfinished_logs()
+
+    if args.no_metadata_usage:
+        Settings.get().USE_METADATA_FILE = False
+
+    # datasets from journal are processed again by the first resync
+    try:
+        watcher.watch()
+    except watcher.InotifyError as e:
+        print(f"Error: watch mode can not be started, {e}")
+        sys.exit(1)
 
 
 def run_test_remove(args):
@@ -56,6 +101,22 @@ def runCheck(args):
     filesystem.scan_watched_directories(True)
 
 
+def set_cassette(args):
+    cassette_config = Settings.get().config["restClient"]["cassette"]
+    if args.record_cassette and args.replay_cassette:
+        print("Error: --record-cassette and --replay-cassette can not be used together")
+        sys.exit(1)
+
+    if args.record_cassette:
+        cassette_config["mode"] = "record"
+        cassette_config["path"] = args.record_cassette
+    if args.replay_cassette:
+        cassette_config["mode"] = "replay"
+        cassette_config["path"] = args.replay_cassette
+    if args.replay_latency_scale is not None:
+        cassette_config["latencyScale"] = args.replay_latency_scale
+
+
 def main():
     parser = argparse.ArgumentParser(description="FS2OD - Filesystem to Onedata importing software")
     parser.add_argument(
@@ -65,6 +126,18 @@ def main():
         type=str,
         help="Path to YAML configuration file (default value is ./config.yaml)",
     )
+    parser.add_argument(
+        "--record-cassette", required=False, type=str, metavar="PATH",
+        help="Record all requests and responses to given cassette file",
+    )
+    parser.add_argument(
+        "--replay-cassette", required=False, type=str, metavar="PATH",
+        help="Do not send requests, answer them with responses recorded in given cassette file",
+    )
+    parser.add_argument(
+        "--replay-latency-scale", required=False, type=float, metavar="SCALE",
+        help="Multiply latency of replayed responses by given value, 0 turns latency off",
+    )
     subparsers = parser.add_subparsers(help="Name of workflow which will be run")
 
     parser_1 = subparsers.add_parser("scan", help="Scan watched directories and import to Onedata")
@@ -76,6 +149,22 @@ def main():
         "--no-metadata-usage", required=False, action="store_true",
         help="If included, metadata file (as .fs2od) is not used"
     )
+    parser_1.add_argument(
+        "--full-scan", required=False, action="store_true",
+        help="If included, all datasets are processed, even these which did not change since last run"
+    )
+
+    parser_5 = subparsers.add_parser(
+        "watch", help="Watch directories and import new datasets to Onedata as soon as they appear"
+    )
+    parser_5.set_defaults(func=runWatch)
+    parser_5.add_argument(
+        "--no-test-connection", required=False, action="store_true", help="If included, tests will not be performed"
+    )
+    parser_5.add_argument(
+        "--no-metadata-usage", required=False, action="store_true",
+        help="If included, metadata file (as .fs2od) is not used"
+    )
 
     parser_2 = subparsers.add_parser("test", help="Do defined test workflow")
     subparser_2 = parser_2.add_subparsers(help="Name of test workflow which will be run")
@@ -232,6 +321,7 @@ def main():
         return
     # init singleton class with configuration
     Settings(args.config)
+    set_cassette(args)
     args.func(args)
 
 
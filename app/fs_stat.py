@@ -0,0 +1,96 @@
+"""
+Classification of files and directories with minimal number of stat syscalls, on GPFS each of them is
+a metadata round trip. Type of entries listed by os.scandir is known from directory listing (d_type),
+so DirEntry is used whenever it is available and only symbolic links are followed by stat.
+Remaining stat syscalls made by fs2od (checks of paths) are counted and reported at the end of the run.
+Filesystems which do not report type in listing (DT_UNKNOWN) stat inside DirEntry, it is not counted.
+Writes of metadata files are counted too, together with writes skipped because the file already had the content.
+"""
+import collections
+import os
+import threading
+from utils import Logger
+
+_statistics = collections.Counter()
+_write_statistics = collections.Counter()
+_statistics_lock = threading.Lock()
+
+
+def _count(kind: str) -> None:
+    with _statistics_lock:
+        _statistics[kind] += 1
+
+
+def is_dir(entry: os.DirEntry) -> bool:
+    """
+    Returns True if entry is directory (or symbolic link to directory).
+    """
+    if entry.is_symlink():
+        _count("followed symlinks")
+    else:
+        _count("typed entries")
+    return entry.is_dir()
+
+
+def is_file(entry: os.DirEntry) -> bool:
+    """
+    Returns True if entry is regular file (or symbolic link to regular file).
+    """
+    if entry.is_symlink():
+        _count("followed symlinks")
+    else:
+        _count("typed entries")
+    return entry.is_file()
+
+
+def path_is_dir(path: str) -> bool:
+    _count("isdir")
+    return os.path.isdir(path)
+
+
+def path_is_file(path: str) -> bool:
+    _count("isfile")
+    return os.path.isfile(path)
+
+
+def path_exists(path: str) -> bool:
+    _count("exists")
+    return os.path.exists(path)
+
+
+def stat(path: str) -> os.stat_result:
+    _count("stat")
+    return os.stat(path)
+
+
+def stat_entry(entry: os.DirEntry) -> os.stat_result:
+    """
+    Returns stat of entry, the result is cached by the entry.
+    """
+    _count("stat")
+    return entry.stat()
+
+
+def count_write(skipped: bool) -> None:
+    with _statistics_lock:
+        _write_statistics["skipped" if skipped else "written"] += 1
+
+
+def get_statistics() -> dict:
+    """
+    Returns numbers of classifications by kind, all kinds except typed entries are stat syscalls.
+    """
+    with _statistics_lock:
+        return dict(_statistics)
+
+
+def log_statistics() -> None:
+    statistics = get_statistics()
+    typed_entries = statistics.pop("typed entries", 0)
+    details = ", ".join(f"{count} {kind}" for kind, count in sorted(statistics.items()))
+    Logger.log(3, f"Filesystem: {sum(statistics.values())} stat syscalls ({details or 'none'}), "
+                  f"{typed_entries} entries classified without stat")
+    with _statistics_lock:
+        written, skipped = _write_statistics["written"], _write_statistics["skipped"]
+    if written or skipped:
+        Logger.log(3, f"Filesystem: {written} files written, {skipped} writes of unchanged files skipped")
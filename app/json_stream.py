@@ -0,0 +1,134 @@
+"""
+Incremental decoding of JSON arrays from chunks of response body. Items of the array are yielded as soon
+as they are received, only the currently decoded item is kept in the buffer (its size is limited).
+"""
+import codecs
+import json
+from typing import Iterable, Iterator, Optional
+
+WHITESPACE = " \t\n\r"
+# characters which can continue a number, valid JSON never has them right after a complete number
+NUMBER_CHARACTERS = "0123456789+-.eE"
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[bytes], max_buffer_size: int):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._max_buffer_size = max_buffer_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _read_chunk(self) -> bool:
+        """
+        Appends next chunk to buffer, returns False if there are no more chunks.
+        """
+        if self.eof:
+            return False
+
+        # already processed part of buffer is dropped
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+
+        try:
+            chunk = next(self._chunks)
+            self.buffer += self._decoder.decode(chunk)
+        except StopIteration:
+            self.buffer += self._decoder.decode(b"", final=True)
+            self.eof = True
+
+        if len(self.buffer) > self._max_buffer_size:
+            raise JSONStreamError(f"JSON value is bigger than buffer ({self._max_buffer_size} characters)")
+        return True
+
+    def peek(self) -> str:
+        """
+        Returns next non-whitespace character (without consuming it) or empty string at the end of the stream.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._read_chunk():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            raise JSONStreamError(f"Expected one of '{characters}', found '{character}'")
+        self.position += 1
+        return character
+
+    def read_value(self):
+        """
+        Decodes next JSON value, reads more chunks until the value is complete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as e:
+                if not self._read_chunk():
+                    raise JSONStreamError(f"Invalid JSON: {e}") from e
+                continue
+
+            # number at the end of buffer can continue in the next chunk, decoder takes only complete part of number
+            # split after "." or exponent (e.g. "1." + "5"), so number followed by such character is not complete
+            if not self.eof and (end == len(self.buffer) or (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and self.buffer[end] in NUMBER_CHARACTERS)):
+                self._read_chunk()
+                continue
+
+            self.position = end
+            return value
+
+
+def iter_array(chunks: Iterable[bytes], key: Optional[str] = None, other_fields: Optional[dict] = None,
+               max_buffer_size: int = 1048576) -> Iterator:
+    """
+    Yields items of JSON array from chunks of JSON document. If key is None, document has to be an array,
+    otherwise document has to be an object and items of array under given key are yielded.
+    Other values of the object are stored to other_fields (when given) during the iteration.
+    """
+    reader = _Reader(chunks, max_buffer_size)
+
+    if key is None:
+        yield from _iter_items(reader)
+        return
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        field = reader.read_value()
+        reader.expect(":")
+        if field == key and reader.peek() == "[":
+            yield from _iter_items(reader)
+        else:
+            value = reader.read_value()
+            if other_fields is not None:
+                other_fields[field] = value
+
+        if reader.expect(",}") == "}":
+            return
+
+
+def _iter_items(reader: _Reader) -> Iterator:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.position += 1
+        return
+
+    while True:
+        yield reader.read_value()
+        if reader.expect(",]") == "]":
+            return
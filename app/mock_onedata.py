@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for REST API of Onezone, Oneprovider (with Onepanel) and DAREG used for load testing of fs2od.
+Only endpoints used by fs2od are implemented, state is kept in memory. Latency and errors can be injected,
+spaces can be created in advance together with directories of datasets which refer to them.
+Counts of received requests are returned at /mock/stats (and reset by POST to /mock/stats/reset).
+
+Example:
+    python mock_onedata.py --port 8080 --spaces 100000 --new-datasets 100 --generate-datasets /tmp/datasets
+then use http://127.0.0.1:8080 as host of Onezone and Oneproviders, http://127.0.0.1:8080/dareg as host of DAREG
+and /tmp/datasets as watched directory in configuration file of fs2od.
+"""
+import argparse
+import collections
+import hashlib
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from typing import Optional
+
+API_PREFIX = "/api/v3/"
+PROVIDER_ID = "mockprovider"
+USER_ID = "mockuser"
+
+
+def get_id(kind: str, key) -> str:
+    """
+    Returns deterministic id of object of given kind, so generated directories and server state match.
+    """
+    return hashlib.sha1(f"{kind}-{key}".encode("utf-8")).hexdigest()
+
+
+def _error(error_id: str, description: str, details: Optional[dict] = None) -> dict:
+    error = {"id": error_id, "description": description}
+    if details is not None:
+        error["details"] = details
+    return {"error": error}
+
+
+class MockOnedata:
+    def __init__(self, files_per_space: int = 0, import_duration: float = 0.0):
+        self.files_per_space = files_per_space
+        self.import_duration = import_duration
+        self.spaces: dict = {}
+        self.storages: dict = {}
+        self.groups: dict = {}
+        self.tokens: dict = {}
+        self.shares: dict = {}
+        self.transfers: dict = {}
+        self.qos_requirements: dict = {}
+        # space ids by file ids of root directories of spaces
+        self.root_files: dict = {}
+        # modes of files changed by requests, other files have default mode
+        self.file_modes: dict = {}
+        self._counter = 0
+        self._lock = threading.RLock()
+
+    def _new_id(self, kind: str) -> str:
+        self._counter += 1
+        return get_id(kind, self._counter + 10 ** 9)
+
+    def add_space(self, name: str, space_id: Optional[str] = None, mount_point: str = "",
+                  supported: bool = False) -> str:
+        with self._lock:
+            space_id = space_id or self._new_id("space")
+            self.spaces[space_id] = {
+                "spaceId": space_id,
+                "name": name,
+                "fileId": get_id("file", space_id),
+                "groups": [],
+                "shares": [],
+                "transfers": [],
+                "support": None,
+            }
+            self.root_files[self.spaces[space_id]["fileId"]] = space_id
+            if supported:
+                storage_id = self.add_storage(name, mount_point)
+                self._support(space_id, storage_id, 2 ** 30)
+            return space_id
+
+    def add_storage(self, name: str, mount_point: str) -> str:
+        with self._lock:
+            storage_id = self._new_id("storage")
+            self.storages[storage_id] = {
+                "id": storage_id, "name": name, "type": "posix", "mountPoint": mount_point,
+                "importedStorage": True, "readonly": True,
+            }
+            return storage_id
+
+    def _support(self, space_id: str, storage_id: str, size: int, import_config: Optional[dict] = None) -> None:
+        self.spaces[space_id]["support"] = {
+            "size": size,
+            "storageId": storage_id,
+            "dirStatsServiceEnabled": False,
+            "autoStorageImportConfig": import_config or {
+                "continuousScan": False, "scanInterval": 60, "detectModifications": False, "detectDeletions": False,
+            },
+            "importFinishes": 0.0,
+        }
+
+    def _get_space_by_root(self, file_id: str) -> Optional[dict]:
+        return self.spaces.get(self.root_files.get(file_id, ""))
+
+    def _file_attributes(self, file_id: str) -> Optional[dict]:
+        """
+        Returns attributes of root directory of space or of one of files in it (id is <root id>-<index>).
+        """
+        root_file_id, _, index = file_id.partition("-")
+        space = self._get_space_by_root(root_file_id)
+        if space is None:
+            return None
+        if not index:
+            return {"file_id": file_id, "name": space["name"], "type": "DIR",
+                    "mode": self.file_modes.get(file_id, "775"), "size": 0}
+        if not index.isdigit() or int(index) >= self.files_per_space:
+            return None
+        return {"file_id": file_id, "name": f"file_{index}", "type": "REG",
+                "mode": self.file_modes.get(file_id, "664"), "size": 1024}
+
+    def _children(self, file_id: str) -> Optional[list]:
+        if self._get_space_by_root(file_id) is None:
+            return None
+        return [{"file_id": f"{file_id}-{index}", "name": f"file_{index}"} for index in range(self.files_per_space)]
+
+    def handle(self, method: str, path: str, query: dict, body) -> tuple:
+        """
+        Processes request, returns tuple (status code, body, headers).
+        """
+        with self._lock:
+            for route_method, pattern, handler in ROUTES:
+                if route_method != method:
+                    continue
+                match = pattern.fullmatch(path)
+                if match:
+                    return handler(self, *match.groups(), query=query, body=body)
+        return 404, _error("notFound", f"{method} {path} is not implemented by mock"), {}
+
+    # Onezone
+
+    def get_configuration(self, **_):
+        return 200, {"build": "mock", "version": "21.02.1"}, {}
+
+    def get_current_user(self, **_):
+        return 200, {"userId": USER_ID, "fullName": "Mock user"}, {}
+
+    def list_effective_groups(self, **_):
+        return 200, {"groups": list(self.groups)}, {}
+
+    def list_providers(self, **_):
+        return 200, {"providers": [PROVIDER_ID]}, {}
+
+    def get_provider(self, provider_id, **_):
+        if provider_id != PROVIDER_ID:
+            return 404, _error("notFound", "Provider not found"), {}
+        return 200, {"providerId": PROVIDER_ID, "name": "mock", "domain": "127.0.0.1"}, {}
+
+    def list_provider_spaces(self, provider_id, **_):
+        return 200, {"spaces": [space_id for space_id, space in self.spaces.items() if space["support"]]}, {}
+
+    def create_space_for_group(self, group_id, body, **_):
+        space_id = self.add_space(body["name"])
+        self.spaces[space_id]["groups"].append(group_id)
+        return 201, None, {"Location": f"{API_PREFIX}onezone/spaces/{space_id}"}
+
+    def get_onezone_space(self, space_id, **_):
+        space = self.spaces.get(space_id)
+        if space is None:
+            return 404, _error("notFound", "Space not found"), {}
+        providers = {PROVIDER_ID: space["support"]["size"]} if space["support"] else {}
+        return 200, {"spaceId": space_id, "name": space["name"], "providers": providers}, {}
+
+    def delete_space(self, space_id, **_):
+        space = self.spaces.pop(space_id, None)
+        if space is None:
+            return 404, _error("notFound", "Space not found"), {}
+        self.root_files.pop(space["fileId"], None)
+        return 204, None, {}
+
+    def list_space_shares(self, space_id, **_):
+        space = self.spaces.get(space_id)
+        if space is None:
+            return 404, _error("notFound", "Space not found"), {}
+        return 200, {"shares": list(space["shares"])}, {}
+
+    def list_space_groups(self, space_id, **_):
+        space = self.spaces.get(space_id)
+        if space is None:
+            return 404, _error("notFound", "Space not found"), {}
+        return 200, {"groups": list(space["groups"])}, {}
+
+    def add_group_to_space(self, space_id, group_id, **_):
+        space = self.spaces.get(space_id)
+        if space is None or group_id not in self.groups:
+            return 404, _error("notFound", "Space or group not found"), {}
+        space["groups"].append(group_id)
+        return 204, None, {}
+
+    def create_group(self, body, **_):
+        group_id = self._new_id("group")
+        self.groups[group_id] = {"groupId": group_id, "name": body["name"], "type": body.get("type", "team")}
+        return 201, None, {"Location": f"{API_PREFIX}onezone/groups/{group_id}"}
+
+    def create_child_group(self, parent_id, body, **_):
+        group_id = self.create_group(body=body)[2]["Location"].split("groups/")[1]
+        return 201, None, {"Location": f"{API_PREFIX}onezone/groups/{parent_id}/children/{group_id}"}
+
+    def create_parent_group(self, child_id, body, **_):
+        group_id = self.create_group(body=body)[2]["Location"].split("groups/")[1]
+        return 201, None, {"Location": f"{API_PREFIX}onezone/groups/{child_id}/parents/{group_id}"}
+
+    def get_group(self, group_id, **_):
+        if group_id not in self.groups:
+            return 404, _error("notFound", "Group not found"), {}
+        return 200, self.groups[group_id], {}
+
+    def delete_group(self, group_id, **_):
+        if self.groups.pop(group_id, None) is None:
+            return 404, _error("notFound", "Group not found"), {}
+        return 204, None, {}
+
+    def create_named_token(self, user_id, body, **_):
+        if any(token["name"] == body["name"] for token in self.tokens.values()):
+            return 400, _error("badValueIdentifierOccupied", "Name is already used", {"key": "name"}), {}
+        token_id = self._new_id("token")
+        self.tokens[token_id] = {
+            "id": token_id, "name": body["name"], "subject": {"type": "user", "id": user_id},
+            "type": body.get("type", {}), "token": "mocktoken-" + token_id,
+        }
+        return 201, {"tokenId": token_id, "token": self.tokens[token_id]["token"]}, {}
+
+    def create_temporary_token(self, body, **_):
+        invite = body.get("type", {}).get("inviteToken", {})
+        return 201, {"token": "mocktemporary-" + invite.get("spaceId", "")}, {}
+
+    def list_named_tokens(self, user_id, **_):
+        return 200, {"tokens": list(self.tokens)}, {}
+
+    def get_current_user_named_token_by_name(self, name, **_):
+        for token in self.tokens.values():
+            if token["name"] == name:
+                return 200, token, {}
+        return 404, _error("notFound", "Token not found"), {}
+
+    def get_user_named_token_by_name(self, user_id, name, **_):
+        return self.get_current_user_named_token_by_name(name)
+
+    def get_named_token(self, token_id, **_):
+        if token_id not in self.tokens:
+            return 404, _error("notFound", "Token not found"), {}
+        return 200, self.tokens[token_id], {}
+
+    def delete_named_token(self, token_id, **_):
+        if self.tokens.pop(token_id, None) is None:
+            return 404, _error("notFound", "Token not found"), {}
+        return 204, None, {}
+
+    # Oneprovider
+
+    def list_user_spaces(self, **_):
+        return 200, [{"spaceId": space_id, "name": space["name"]} for space_id, space in self.spaces.items()], {}
+
+    def get_provider_space(self, space_id, **_):
+        space = self.spaces.get(space_id)
+        if space is None or not space["support"]:
+            return 404, _error("notFound", "Space not found"), {}
+        return 200, {
+            "spaceId": space_id, "name": space["name"], "fileId": space["fileId"],
+            "providers": [{"providerId": PROVIDER_ID, "providerName": "mock"}],
+        }, {}
+
+    def list_transfers(self, space_id, **_):
+        space = self.spaces.get(space_id)
+        if space is None:
+            return 404, _error("notFound", "Space not found"), {}
+        return 200, {"transfers": list(space["transfers"]), "nextPageToken": None}, {}
+
+    def create_transfer(self, body, **_):
+        transfer_id = self._new_id("transfer")
+        self.transfers[transfer_id] = {
+            "transferId": transfer_id, "type": body.get("type"), "fileId": body.get("fileId"),
+            "replicationStatus": "completed", "transferStatus": "completed",
+        }
+        return 201, {"transferId": transfer_id}, {}
+
+    def get_transfer(self, transfer_id, **_):
+        if transfer_id not in self.transfers:
+            return 404, _error("notFound", "Transfer not found"), {}
+        return 200, self.transfers[transfer_id], {}
+
+    def create_share(self, body, **_):
+        space = self._get_space_by_root(body.get("fileId", ""))
+        share_id = self._new_id("share")
+        self.shares[share_id] = {
+            "shareId": share_id, "name": body["name"], "description": body.get("description", ""),
+            "fileId": body.get("fileId"), "spaceId": space["spaceId"] if space else None,
+            "publicUrl": f"https://mock.onedata/share/{share_id}",
+        }
+        if space is not None:
+            space["shares"].append(share_id)
+        return 201, {"shareId": share_id}, {}
+
+    def get_share(self, share_id, **_):
+        if share_id not in self.shares:
+            return 404, _error("notFound", "Share not found"), {}
+        return 200, self.shares[share_id], {}
+
+    def update_share(self, share_id, body, **_):
+        if share_id not in self.shares:
+            return 404, _error("notFound", "Share not found"), {}
+        self.shares[share_id].update({key: body[key] for key in ("name", "description") if key in body})
+        return 204, None, {}
+
+    def get_file_attributes(self, file_id, **_):
+        attributes = self._file_attributes(file_id)
+        if attributes is None:
+            return 404, _error("notFound", "File not found"), {}
+        return 200, attributes, {}
+
+    def set_file_attributes(self, file_id, body, **_):
+        if self._file_attributes(file_id) is None:
+            return 404, _error("notFound", "File not found"), {}
+        self.file_modes[file_id] = body["mode"]
+        return 204, None, {}
+
+    def list_children(self, file_id, query, **_):
+        children = self._children(file_id)
+        if children is None:
+            return 404, _error("notFound", "Directory not found"), {}
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["1000"])[0])
+        page = children[offset:offset + limit]
+        is_last = offset + limit >= len(children)
+        return 200, {"children": page, "isLast": is_last, "nextPageToken": None if is_last else str(offset + limit)}, {}
+
+    def download_file_content(self, file_id, **_):
+        if self._file_attributes(file_id) is None:
+            return 404, _error("notFound", "File not found"), {}
+        return 200, b"\0" * 1024, {"Content-Type": "application/octet-stream"}
+
+    def set_json_metadata(self, file_id, **_):
+        return 204, None, {}
+
+    def get_qos_summary(self, file_id, **_):
+        requirements = {requirement_id: "fulfilled" for requirement_id, requirement in self.qos_requirements.items()
+                        if requirement["fileId"] == file_id}
+        return 200, {"requirements": requirements, "status": "fulfilled"}, {}
+
+    def add_qos_requirement(self, body, **_):
+        requirement_id = self._new_id("qos")
+        self.qos_requirements[requirement_id] = dict(body)
+        return 201, {"qosRequirementId": requirement_id}, {}
+
+    def delete_qos_requirement(self, requirement_id, **_):
+        if self.qos_requirements.pop(requirement_id, None) is None:
+            return 404, _error("notFound", "QoS requirement not found"), {}
+        return 204, None, {}
+
+    def get_file_distribution(self, file_id, **_):
+        return 200, {"type": "reg", "distributionPerProvider": {PROVIDER_ID: {"blocks": [[0, 1024]]}}}, {}
+
+    def lookup_file_id(self, path, **_):
+        space_name = path.strip("/").split("/")[0]
+        for space in self.spaces.values():
+            if space["name"] == space_name:
+                return 200, {"fileId": space["fileId"]}, {}
+        return 404, _error("notFound", "Path not found"), {}
+
+    # Onepanel
+
+    def list_supported_spaces(self, **_):
+        return 200, {"ids": [space_id for space_id, space in self.spaces.items() if space["support"]]}, {}
+
+    def support_space(self, body, **_):
+        space_id = body["token"].split("-", 1)[1] if "-" in body["token"] else ""
+        if space_id not in self.spaces or body["storageId"] not in self.storages:
+            return 400, _error("badValueToken", "Invalid token or storage"), {}
+        import_config = body.get("storageImport", {}).get("autoStorageImportConfig")
+        self._support(space_id, body["storageId"], body["size"], import_config)
+        return 201, {"id": space_id}, {}
+
+    def _get_support(self, space_id: str) -> Optional[dict]:
+        space = self.spaces.get(space_id)
+        return space["support"] if space else None
+
+    def get_space_details(self, space_id, **_):
+        support = self._get_support(space_id)
+        if support is None:
+            return 404, _error("notFound", "Space is not supported"), {}
+        return 200, {
+            "id": space_id, "name": self.spaces[space_id]["name"], "storageId": support["storageId"],
+            "importedStorage": True, "totalSize": support["size"], "spaceOccupancy": 1024 * self.files_per_space,
+            "dirStatsServiceEnabled": support["dirStatsServiceEnabled"],
+            "storageImport": {"mode": "auto", "autoStorageImportConfig": support["autoStorageImportConfig"]},
+            "supportingProviders": {PROVIDER_ID: support["size"]},
+        }, {}
+
+    def modify_space(self, space_id, body, **_):
+        support = self._get_support(space_id)
+        if support is None:
+            return 404, _error("notFound", "Space is not supported"), {}
+        if "size" in body:
+            support["size"] = body["size"]
+        if "dirStatsServiceEnabled" in body:
+            support["dirStatsServiceEnabled"] = body["dirStatsServiceEnabled"]
+        if "autoStorageImportConfig" in body:
+            support["autoStorageImportConfig"].update(body["autoStorageImportConfig"])
+        return 204, None, {}
+
+    def revoke_support(self, space_id, **_):
+        if self._get_support(space_id) is None:
+            return 404, _error("notFound", "Space is not supported"), {}
+        self.spaces[space_id]["support"] = None
+        return 204, None, {}
+
+    def get_import_info(self, space_id, **_):
+        support = self._get_support(space_id)
+        if support is None:
+            return 404, _error("notFound", "Space is not supported"), {}
+        status = "running" if time.time() < support["importFinishes"] else "completed"
+        return 200, {"status": status, "start": None, "stop": None}, {}
+
+    def force_start_import(self, space_id, **_):
+        support = self._get_support(space_id)
+        if support is None:
+            return 404, _error("notFound", "Space is not supported"), {}
+        if time.time() < support["importFinishes"]:
+            return 409, _error("alreadyRunning", "Import is already running"), {}
+        support["importFinishes"] = time.time() + self.import_duration
+        return 204, None, {}
+
+    def force_stop_import(self, space_id, **_):
+        support = self._get_support(space_id)
+        if support is None:
+            return 404, _error("notFound", "Space is not supported"), {}
+        support["importFinishes"] = 0.0
+        return 204, None, {}
+
+    def list_storages(self, **_):
+        return 200, {"ids": list(self.storages)}, {}
+
+    def add_storages(self, body, **_):
+        created = {}
+        for name, storage in body.items():
+            storage_id = self.add_storage(name, storage.get("mountPoint", ""))
+            created[name] = {"id": storage_id}
+        return 200, created, {}
+
+    def get_storage(self, storage_id, **_):
+        if storage_id not in self.storages:
+            return 404, _error("notFound", "Storage not found"), {}
+        return 200, self.storages[storage_id], {}
+
+    def remove_storage(self, storage_id, **_):
+        if self.storages.pop(storage_id, None) is None:
+            return 404, _error("notFound", "Storage not found"), {}
+        return 204, None, {}
+
+    # DAREG
+
+    def dareg_index(self, **_):
+        return 200, b"DAREG mock", {"Content-Type": "text/html"}
+
+    def dareg_create(self, body=None, **_):
+        return 201, {}, {}
+
+    def dareg_update(self, space_id, body=None, **_):
+        return 200, {}, {}
+
+
+def _route(method: str, path: str, handler) -> tuple:
+    # {name} matches one path segment
+    pattern = re.compile(re.sub(r"\{\w+}", "([^/]+)", path))
+    return method, pattern, handler
+
+
+ROUTES = [
+    _route("GET", "/api/v3/onezone/configuration", MockOnedata.get_configuration),
+    _route("GET", "/api/v3/onezone/user", MockOnedata.get_current_user),
+    _route("GET", "/api/v3/onezone/user/effective_groups", MockOnedata.list_effective_groups),
+    _route("GET", "/api/v3/onezone/providers/?", MockOnedata.list_providers),
+    _route("GET", "/api/v3/onezone/providers/{id}", MockOnedata.get_provider),
+    _route("GET", "/api/v3/onezone/providers/{id}/spaces", MockOnedata.list_provider_spaces),
+    _route("POST", "/api/v3/onezone/groups/{id}/spaces", MockOnedata.create_space_for_group),
+    _route("GET", "/api/v3/onezone/spaces/{id}", MockOnedata.get_onezone_space),
+    _route("DELETE", "/api/v3/onezone/spaces/{id}", MockOnedata.delete_space),
+    _route("GET", "/api/v3/onezone/spaces/{id}/shares", MockOnedata.list_space_shares),
+    _route("GET", "/api/v3/onezone/spaces/{id}/groups", MockOnedata.list_space_groups),
+    _route("PUT", "/api/v3/onezone/spaces/{id}/groups/{id}", MockOnedata.add_group_to_space),
+    _route("POST", "/api/v3/onezone/groups", MockOnedata.create_group),
+    _route("POST", "/api/v3/onezone/groups/{id}/children", MockOnedata.create_child_group),
+    _route("POST", "/api/v3/onezone/groups/{id}/parents", MockOnedata.create_parent_group),
+    _route("GET", "/api/v3/onezone/groups/{id}", MockOnedata.get_group),
+    _route("DELETE", "/api/v3/onezone/groups/{id}", MockOnedata.delete_group),
+    _route("POST", "/api/v3/onezone/users/{id}/tokens/named", MockOnedata.create_named_token),
+    _route("GET", "/api/v3/onezone/users/{id}/tokens/named", MockOnedata.list_named_tokens),
+    _route("GET", "/api/v3/onezone/users/{id}/tokens/named/name/{name}", MockOnedata.get_user_named_token_by_name),
+    _route("GET", "/api/v3/onezone/user/tokens/named/name/{name}", MockOnedata.get_current_user_named_token_by_name),
+    _route("POST", "/api/v3/onezone/user/tokens/temporary", MockOnedata.create_temporary_token),
+    _route("GET", "/api/v3/onezone/tokens/named/{id}", MockOnedata.get_named_token),
+    _route("DELETE", "/api/v3/onezone/tokens/named/{id}", MockOnedata.delete_named_token),
+    _route("GET", "/api/v3/oneprovider/configuration", MockOnedata.get_configuration),
+    _route("GET", "/api/v3/oneprovider/spaces", MockOnedata.list_user_spaces),
+    _route("GET", "/api/v3/oneprovider/spaces/{id}", MockOnedata.get_provider_space),
+    _route("GET", "/api/v3/oneprovider/spaces/{id}/transfers", MockOnedata.list_transfers),
+    _route("POST", "/api/v3/oneprovider/transfers", MockOnedata.create_transfer),
+    _route("GET", "/api/v3/oneprovider/transfers/{id}", MockOnedata.get_transfer),
+    _route("POST", "/api/v3/oneprovider/shares", MockOnedata.create_share),
+    _route("GET", "/api/v3/oneprovider/shares/{id}", MockOnedata.get_share),
+    _route("PATCH", "/api/v3/oneprovider/shares/{id}", MockOnedata.update_share),
+    _route("GET", "/api/v3/oneprovider/data/{id}", MockOnedata.get_file_attributes),
+    _route("PUT", "/api/v3/oneprovider/data/{id}", MockOnedata.set_file_attributes),
+    _route("GET", "/api/v3/oneprovider/data/{id}/children", MockOnedata.list_children),
+    _route("GET", "/api/v3/oneprovider/data/{id}/content", MockOnedata.download_file_content),
+    _route("PUT", "/api/v3/oneprovider/data/{id}/metadata/json", MockOnedata.set_json_metadata),
+    _route("GET", "/api/v3/oneprovider/data/{id}/qos_summary", MockOnedata.get_qos_summary),
+    _route("GET", "/api/v3/oneprovider/data/{id}/distribution", MockOnedata.get_file_distribution),
+    _route("POST", "/api/v3/oneprovider/qos_requirements", MockOnedata.add_qos_requirement),
+    _route("DELETE", "/api/v3/oneprovider/qos-requirements/{id}", MockOnedata.delete_qos_requirement),
+    _route("POST", "/api/v3/oneprovider/lookup-file-id/(.+)", MockOnedata.lookup_file_id),
+    _route("GET", "/api/v3/onepanel/provider/spaces", MockOnedata.list_supported_spaces),
+    _route("POST", "/api/v3/onepanel/provider/spaces", MockOnedata.support_space),
+    _route("GET", "/api/v3/onepanel/provider/spaces/{id}", MockOnedata.get_space_details),
+    _route("PATCH", "/api/v3/onepanel/provider/spaces/{id}", MockOnedata.modify_space),
+    _route("DELETE", "/api/v3/onepanel/provider/spaces/{id}", MockOnedata.revoke_support),
+    _route("GET", "/api/v3/onepanel/provider/spaces/{id}/storage-import/auto/info", MockOnedata.get_import_info),
+    _route("POST", "/api/v3/onepanel/provider/spaces/{id}/storage-import/auto/force-start",
+           MockOnedata.force_start_import),
+    _route("POST", "/api/v3/onepanel/provider/spaces/{id}/storage-import/auto/force-stop",
+           MockOnedata.force_stop_import),
+    _route("GET", "/api/v3/onepanel/provider/storages", MockOnedata.list_storages),
+    _route("POST", "/api/v3/onepanel/provider/storages", MockOnedata.add_storages),
+    _route("GET", "/api/v3/onepanel/provider/storages/{id}", MockOnedata.get_storage),
+    _route("DELETE", "/api/v3/onepanel/provider/storages/{id}", MockOnedata.remove_storage),
+    _route("GET", "/dareg/?", MockOnedata.dareg_index),
+    _route("POST", "/dareg/datasets/", MockOnedata.dareg_create),
+    _route("PATCH", "/dareg/datasets/{id}/", MockOnedata.dareg_update),
+    _route("POST", "/dareg/logs/", MockOnedata.dareg_create),
+]
+
+
+class Statistics:
+    def __init__(self):
+        self.started = time.time()
+        self.requests: collections.Counter = collections.Counter()
+        self.injected_errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, method: str, path: str, injected_error: bool) -> None:
+        # ids are replaced, so requests are counted for each endpoint
+        template = re.sub(r"/[0-9a-f]{16,}(-\d+)?(?=/|$)", "/{id}", path)
+        with self._lock:
+            self.requests[f"{method} {template}"] += 1
+            if injected_error:
+                self.injected_errors += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.requests.clear()
+            self.injected_errors = 0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            total = sum(self.requests.values())
+            elapsed = time.time() - self.started
+            return {
+                "total": total,
+                "injectedErrors": self.injected_errors,
+                "elapsed": elapsed,
+                "requestsPerSecond": total / elapsed if elapsed else 0.0,
+                "requests": dict(self.requests.most_common()),
+            }
+
+
+class MockRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # set by run()
+    mock: MockOnedata = None
+    statistics: Statistics = None
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    def _send(self, status: int, body, headers: dict) -> None:
+        if isinstance(body, bytes):
+            content = body
+        elif body is None:
+            content = b""
+        else:
+            content = json.dumps(body).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        url = urllib.parse.urlsplit(self.path)
+        path = urllib.parse.unquote(url.path)
+
+        if path.startswith("/mock/stats"):
+            if self.command == "POST" and path == "/mock/stats/reset":
+                self.statistics.reset()
+            self._send(200, self.statistics.to_dict(), {})
+            return
+
+        delay = self.latency + random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        injected_error = random.random() < self.error_rate
+        self.statistics.record(self.command, path, injected_error)
+        if injected_error:
+            self._send(self.error_status, _error("injectedError", "Error injected by mock"), {})
+            return
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            self._send(400, _error("badMessage", "Body is not valid JSON"), {})
+            return
+
+        status, response_body, headers = self.mock.handle(
+            self.command, path, urllib.parse.parse_qs(url.query), body
+        )
+        self._send(status, response_body, dict(headers))
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        # logging of every request would slow down load tests
+        pass
+
+
+def generate_datasets(mock: MockOnedata, directory: str, number_of_spaces: int, number_of_new_datasets: int,
+                      metadata_file: str = "SPA.yml", onedata_tag: str = "Onedata") -> None:
+    """
+    Creates spaces in mock and directories of datasets in given directory. Metadata files of first
+    number_of_spaces directories refer to created spaces, remaining directories are new datasets.
+    If directory is None, only spaces are created.
+    """
+    for number in range(number_of_spaces + number_of_new_datasets):
+        name = f"dataset_{number:06d}"
+        dataset_path = os.path.join(directory, name) if directory else ""
+        is_registered = number < number_of_spaces
+        space_id = get_id("space", number)
+        if is_registered:
+            mock.add_space(name, space_id, mount_point=dataset_path, supported=True)
+
+        if not directory:
+            continue
+        os.makedirs(dataset_path, exist_ok=True)
+        with open(os.path.join(dataset_path, metadata_file), "w", encoding="utf-8") as file:
+            file.write(f"Title: {name}\n")
+            if is_registered:
+                file.write(f"{onedata_tag}:\n  Space: {space_id}\n")
+
+
+def run(args: argparse.Namespace) -> None:
+    mock = MockOnedata(files_per_space=args.files_per_space, import_duration=args.import_duration)
+    generate_datasets(mock, args.generate_datasets, args.spaces, args.new_datasets, args.metadata_file,
+                      args.onedata_tag)
+
+    MockRequestHandler.mock = mock
+    MockRequestHandler.statistics = Statistics()
+    MockRequestHandler.latency = args.latency
+    MockRequestHandler.latency_jitter = args.latency_jitter
+    MockRequestHandler.error_rate = args.error_rate
+    MockRequestHandler.error_status = args.error_status
+
+    server = http.server.ThreadingHTTPServer((args.host, args.port), MockRequestHandler)
+    server.daemon_threads = True
+    print(f"Mock of Onedata with {len(mock.spaces)} spaces listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock of Onezone, Oneprovider, Onepanel and DAREG for load testing")
+    parser.add_argument("--host", default="127.0.0.1", type=str, help="Address to listen on")
+    parser.add_argument("--port", default=8080, type=int, help="Port to listen on")
+    parser.add_argument("--latency", default=0.0, type=float, help="Latency of each response in seconds")
+    parser.add_argument("--latency-jitter", default=0.0, type=float,
+                        help="Random latency up to given seconds added to each response")
+    parser.add_argument("--error-rate", default=0.0, type=float,
+                        help="Fraction of requests answered with error (0.0 - 1.0)")
+    parser.add_argument("--error-status", default=503, type=int, help="Status code of injected errors")
+    parser.add_argument("--spaces", default=0, type=int, help="Number of existing (registered) spaces")
+    parser.add_argument("--new-datasets", default=0, type=int,
+                        help="Number of generated directories of datasets without space")
+    parser.add_argument("--generate-datasets", default=None, type=str, metavar="DIRECTORY",
+                        help="Create directories of datasets with metadata files in given directory")
+    parser.add_argument("--metadata-file", default="SPA.yml", type=str, help="Name of generated metadata files")
+    parser.add_argument("--onedata-tag", default="Onedata", type=str,
+                        help="Tag of Onedata section in generated metadata files (metadataFileTags->onedata)")
+    parser.add_argument("--files-per-space", default=0, type=int, help="Number of files in root of each space")
+    parser.add_argument("--import-duration", default=0.0, type=float,
+                        help="Duration of storage import in seconds")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from typing import Iterator
 from settings import Settings
 from utils import Logger, Utils
 import request
@@ -76,6 +77,15 @@ def get_providers_supported_spaces_from_onezone(provider_id: str) -> list:
     return response_json["spaces"]
 
 
+def iter_providers_supported_spaces_from_onezone(provider_id: str) -> Iterator[str]:
+    """
+    Streaming variant of get_providers_supported_spaces_from_onezone(), yields ids of spaces as they are received.
+    """
+    Logger.log(4, f"iter_providers_supported_spaces_from_onezone(pr_id={provider_id})")
+    url = "onezone/providers/" + provider_id + "/spaces"
+    yield from request.iter_json_array(url, key="spaces")
+
+
 def resolve_provider_id_from_id_or_hostname(id_or_hostname: str) -> str:
     Logger.log(4, f"resolve_provider_id_from_id_or_hostname(id_or_host={id_or_hostname})")
 
@@ -0,0 +1,155 @@
+"""
+Token bucket rate limiters for services (Onezone, Oneprovider and Onepanel of each provider, DAREG).
+Each service instance can receive a burst of requests at once and then requests at steady rate.
+When requests have to wait for tokens, they are served by priority class of the calling code
+(interactive before registration of new datasets before maintenance of existing ones).
+"""
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from settings import Settings
+from utils import Logger
+
+# names of services, Oneprovider and Onepanel names are followed by index of provider (e.g. onepanel_1)
+ONEZONE_SERVICE = "onezone"
+ONEPROVIDER_SERVICE = "oneprovider"
+ONEPANEL_SERVICE = "onepanel"
+DAREG_SERVICE = "dareg"
+
+# priority classes of requests, lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_REGISTRATION = 1
+PRIORITY_MAINTENANCE = 2
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_REGISTRATION: "registration",
+    PRIORITY_MAINTENANCE: "maintenance",
+}
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("priority", default=PRIORITY_INTERACTIVE)
+
+
+def get_current_priority() -> int:
+    """
+    Returns priority class of requests sent by the current code, interactive if none was set.
+    """
+    return _current_priority.get()
+
+
+@contextlib.contextmanager
+def priority_scope(priority: int):
+    """
+    Sets given priority class for requests sent inside with statement.
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # statistics for each priority class
+        self.requests: dict = {priority: 0 for priority in PRIORITY_NAMES}
+        self.delayed_requests: dict = {priority: 0 for priority in PRIORITY_NAMES}
+        self.waited: dict = {priority: 0.0 for priority in PRIORITY_NAMES}
+        # heap of (priority, sequence number) of waiting callers
+        self._waiting: list = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """
+        Takes one token, waits until it is available if the bucket is empty.
+        Waiting callers are served by priority and in order of calls within the same priority.
+        """
+        with self._condition:
+            self.requests[priority] += 1
+            self._refill()
+            if not self._waiting and self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            start = time.monotonic()
+            while True:
+                self._refill()
+                is_first = self._waiting[0] == ticket
+                if is_first and self.tokens >= 1:
+                    break
+                # only the first waiting caller waits for the next token, others wait until it takes it
+                self._condition.wait((1 - self.tokens) / self.rate if is_first else None)
+
+            heapq.heappop(self._waiting)
+            self.tokens -= 1
+            self.delayed_requests[priority] += 1
+            self.waited[priority] += time.monotonic() - start
+            # the next waiting caller becomes first
+            self._condition.notify_all()
+
+
+_buckets: dict = {}
+_buckets_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return Settings.get().config["restClient"]["rateLimit"]["enabled"]
+
+
+def _get_bucket(service: str) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get(service)
+        if bucket is None:
+            # limits are set for kind of service and apply to each its instance
+            limit_config = Settings.get().config["restClient"]["rateLimit"][service.split("_")[0]]
+            bucket = TokenBucket(limit_config["rate"], limit_config["burst"])
+            _buckets[service] = bucket
+
+    return bucket
+
+
+def acquire(service: str) -> None:
+    """
+    Blocks until request to given service can be sent, requests of current priority class
+    are served before waiting requests of lower priority classes.
+    """
+    if not is_enabled():
+        return
+
+    _get_bucket(service).acquire(get_current_priority())
+
+
+def sleep_for_backpressure(multiplier: float) -> None:
+    """
+    Sleeps for multiplier * sleepFactor seconds. These sleeps only protected Onedata services from too many requests,
+    so they are skipped when rate limiter is enabled. Waiting for propagation of changes must use time.sleep().
+    """
+    if is_enabled():
+        return
+
+    time.sleep(multiplier * Settings.get().config["sleepFactor"])
+
+
+def log_statistics() -> None:
+    with _buckets_lock:
+        for service, bucket in _buckets.items():
+            for priority, name in PRIORITY_NAMES.items():
+                if bucket.delayed_requests[priority] == 0:
+                    continue
+                Logger.log(3, f"Rate limiter of {service}: {bucket.delayed_requests[priority]} of "
+                              f"{bucket.requests[priority]} {name} requests delayed, "
+                              f"{bucket.waited[priority]:.1f} s waited in total")
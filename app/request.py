@@ -1,9 +1,237 @@
+import datetime
+import email.utils
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from settings import Settings
+from response_cache import get_response_cache
+from etag_cache import get_etag_cache
+import cassette
+import circuit_breaker
+import deadline
+import json_stream
+import rate_limiter
+from single_flight import SingleFlight
+import request_metrics
 from utils import Logger
 
+# names of endpoints (hosts) which have their own pooled session
+ONEZONE_ENDPOINT = "onezone"
+DAREG_ENDPOINT = "dareg"
+ONEPROVIDER_ENDPOINT_PREFIX = "oneprovider_"
+# methods which can be sent again without changing the result
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+_NOT_PARSED = object()
+
+
+class Response(requests.Response):
+    """
+    Response which hands JSON body already parsed for logging to the first caller of json().
+    Following calls parse the body again, so callers never share (and modify) the same object.
+    """
+    def parse_json(self):
+        self._parsed_json = super().json()
+        return self._parsed_json
+
+    def json(self, **kwargs):
+        parsed_json = self.__dict__.pop("_parsed_json", _NOT_PARSED)
+        if parsed_json is not _NOT_PARSED and not kwargs:
+            return parsed_json
+        return super().json(**kwargs)
+
+
+_sessions: dict = {}
+_sessions_lock = threading.Lock()
+_endpoint_semaphores: dict = {}
+# exceeded deadline belongs to the dataset which sent the request, not to other datasets waiting for it
+_in_flight_gets = SingleFlight(not_shared=(deadline.DeadlineExceeded,))
+
+
+def get_oneprovider_endpoint(oneprovider_index: int) -> str:
+    """
+    Returns name of endpoint of Oneprovider with given index. Oneprovider and its Onepanel share the same host.
+    """
+    return f"{ONEPROVIDER_ENDPOINT_PREFIX}{oneprovider_index}"
+
+
+def get_service_name(url: str, endpoint: str) -> str:
+    """
+    Returns name of service (used by rate limiter) which given processed url of given endpoint belongs to.
+    Oneprovider and its Onepanel share endpoint, but they are different services.
+    """
+    if endpoint.startswith(ONEPROVIDER_ENDPOINT_PREFIX) and "/onepanel/" in url:
+        return rate_limiter.ONEPANEL_SERVICE + endpoint[len(ONEPROVIDER_ENDPOINT_PREFIX) - 1:]
+    return endpoint
+
+
+def get_endpoint_name(url: str, oneprovider_index: int = 0) -> str:
+    """
+    Returns name of endpoint which given (not yet processed) url belongs to.
+    If url does not belong to any communication party, returns empty string
+    """
+    if "oneprovider/" in url or "onepanel/" in url:
+        return get_oneprovider_endpoint(oneprovider_index)
+    if "onezone/" in url:
+        return ONEZONE_ENDPOINT
+    return ""
+
+
+def _create_session() -> requests.Session:
+    pool_config = Settings.get().config["restClient"]["connectionPool"]
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_config["poolSize"])
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if not pool_config["keepAlive"]:
+        # server closes connection after each response, so every request opens a new one
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session(endpoint: str) -> requests.Session:
+    """
+    Returns pooled session for given endpoint, creates it when used for the first time.
+    """
+    with _sessions_lock:
+        session = _sessions.get(endpoint)
+        if session is None:
+            Logger.log(5, f"Creating pooled session for endpoint {endpoint}")
+            session = _create_session()
+            _sessions[endpoint] = session
+
+    return session
+
+
+def get_endpoint_urls() -> dict:
+    """
+    Returns base url of every configured endpoint in format {endpoint: url}.
+    """
+    urls = {ONEZONE_ENDPOINT: Settings.get().ONEZONE_API_URL}
+    for oneprovider_index, url in enumerate(Settings.get().ONEPROVIDERS_API_URL):
+        urls[get_oneprovider_endpoint(oneprovider_index)] = url
+    if Settings.get().DAREG_ENABLED:
+        urls[DAREG_ENDPOINT] = Settings.get().config["dareg"]["host"]
+    return urls
+
+
+def _prewarm_endpoint(endpoint: str, url: str, number_of_connections: int) -> bool:
+    """
+    Opens given number of connections (DNS resolution, TCP and TLS handshake) to the url and puts them
+    to the pool of endpoint's session, no request is sent.
+    """
+    connect_timeout = Settings.get().config["restClient"]["timeout"]["connect"]
+    session = get_session(endpoint)
+    adapter = session.get_adapter(url)
+    pool = adapter.get_connection(url)
+    # certificates are verified the same way as when requests are sent
+    environment_settings = session.merge_environment_settings(url, {}, None, None, None)
+    adapter.cert_verify(pool, url, environment_settings["verify"], environment_settings["cert"])
+    connections = []
+    try:
+        for _ in range(number_of_connections):
+            connection = pool._get_conn()
+            connections.append(connection)
+            # connections already opened (by earlier pre-warming or requests) are kept as they are
+            if connection.sock is None:
+                connection.timeout = connect_timeout
+                connection.connect()
+    except Exception as e:
+        Logger.log(2, f"Cannot open connection to {endpoint} ({url}): {e}")
+        return False
+    finally:
+        for connection in connections:
+            pool._put_conn(connection)
+
+    Logger.log(4, f"Opened {number_of_connections} connections to {endpoint}")
+    return True
+
+
+def prewarm_connections() -> bool:
+    """
+    Opens connections to all configured endpoints concurrently, so start of the run takes as long as
+    connecting to the slowest endpoint. Connections stay in pools and are used by following requests.
+    Returns False if connecting to some endpoint failed.
+    """
+    number_of_connections = Settings.get().config["restClient"]["connectionPool"]["prewarm"]
+    if cassette.is_replaying() or number_of_connections <= 0 or not Settings.get().config["restClient"]["connectionPool"]["keepAlive"]:
+        return True
+
+    urls = get_endpoint_urls()
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        results = list(executor.map(
+            lambda item: _prewarm_endpoint(item[0], item[1], number_of_connections), urls.items()
+        ))
+
+    Logger.log(4, f"Connections to {len(urls)} endpoints opened in {time.monotonic() - start:.3f} s")
+    return all(results)
+
+
+def close_sessions() -> None:
+    """
+    Closes all pooled sessions and their connections.
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_connection_statistics() -> dict:
+    """
+    Returns statistics of connections for each used endpoint in format
+    {endpoint: {"requests": int, "new_connections": int, "reused_connections": int}}
+    """
+    statistics = {}
+    with _sessions_lock:
+        for endpoint, session in _sessions.items():
+            number_of_requests = 0
+            new_connections = 0
+            # both http and https prefixes are mounted to the same adapter
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for pool_key in pools.keys():
+                    pool = pools[pool_key]
+                    number_of_requests += pool.num_requests
+                    new_connections += pool.num_connections
+
+            statistics[endpoint] = {
+                "requests": number_of_requests,
+                "new_connections": new_connections,
+                "reused_connections": max(number_of_requests - new_connections, 0),
+            }
+
+    return statistics
+
+
+def log_statistics() -> None:
+    """
+    Logs statistics collected by request layer during the run.
+    """
+    for endpoint, statistics in get_connection_statistics().items():
+        Logger.log(3, f"Connections to {endpoint}: {statistics['requests']} requests, "
+                      f"{statistics['new_connections']} new connections, "
+                      f"{statistics['reused_connections']} reused connections")
+
+    if _in_flight_gets.coalesced:
+        Logger.log(3, f"{_in_flight_gets.coalesced} GET requests were served by identical request already in flight")
+    get_response_cache().log_statistics()
+    if get_etag_cache() is not None:
+        get_etag_cache().log_statistics()
+    circuit_breaker.log_statistics()
+    rate_limiter.log_statistics()
+
 
 def process_url(url: str, headers, oneprovider_index: int = 0):
+    # do not modify dictionary of caller (or default argument)
+    headers = dict(headers)
     if "oneprovider/" in url or "onepanel/" in url:
         # url of Oneprovider and Onepanel should be the same
         # if oneprovider_index:
@@ -24,6 +252,9 @@ def process_url(url: str, headers, oneprovider_index: int = 0):
 
 
 def response_print(response, ok_statuses: tuple = tuple()) -> None:
+    if circuit_breaker.is_skipped(response):
+        # skipping is already logged
+        return
     if not response.ok and response.status_code not in ok_statuses:
         Logger.log(2, "Response isn't ok (response code = %s)" % response.status_code)
     if not response.ok and response.status_code in ok_statuses:
@@ -32,70 +263,373 @@ def response_print(response, ok_statuses: tuple = tuple()) -> None:
 
 
 def debug_print(response, ok_statuses: tuple = tuple()) -> None:
-    if response.content == b"":
+    """
+    Logs response, its body is logged only when verbose level allows it. Bodies of successful responses
+    are sampled and bodies bigger than maxBodySize are logged truncated without parsing.
+    """
+    is_ok = response.ok or response.status_code in ok_statuses
+    level, content_level = (4, 5) if is_ok else (1, 1)
+    if not Logger.is_enabled(level) or response.content == b"":
         return
 
-    if response.ok or response.status_code in ok_statuses:
-        Logger.log(4, "Requested URL: %s" % response.url)
-        Logger.log(4, "Response: %s" % response)
-        Logger.log(5, "Response content:", pretty_print=response.json())
-    else:
-        Logger.log(1, "Requested URL: %s" % response.url)
-        Logger.log(1, "Response: %s" % response)
-        Logger.log(1, "Response content:", pretty_print=response.json())
+    Logger.log(level, "Requested URL: %s" % response.url)
+    Logger.log(level, "Response: %s" % response)
+
+    logging_config = Settings.get().config["restClient"]["logging"]
+    if not Logger.is_enabled(content_level) or (is_ok and random.random() >= logging_config["bodySampleRate"]):
+        return
+
+    if len(response.content) > logging_config["maxBodySize"]:
+        truncated_content = response.content[:logging_config["maxBodySize"]].decode("utf-8", errors="replace")
+        Logger.log(content_level, f"Response content ({len(response.content)} bytes, truncated): {truncated_content}")
+        return
+
+    Logger.log(content_level, "Response content:", pretty_print=lambda: _parse_for_logging(response))
+
+
+def _parse_for_logging(response):
+    """
+    Returns parsed JSON body of response (text if it is not JSON). Parsed body is kept in response
+    and returned by its next call of json(), so the body is not decoded twice.
+    """
+    try:
+        if isinstance(response, Response):
+            return response.parse_json()
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def get_retry_delay(attempt: int) -> float:
+    """
+    Returns time to wait before next attempt (attempts are numbered from 0), exponential backoff with full jitter.
+    """
+    retry_config = Settings.get().config["restClient"]["retry"]
+    return random.uniform(0, min(retry_config["maxDelay"], retry_config["baseDelay"] * 2 ** attempt))
+
+
+def _get_retry_after(response) -> Optional[float]:
+    """
+    Returns number of seconds from Retry-After header of response or None if it is missing or invalid.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if not retry_after:
+        return None
+
+    if retry_after.isdigit():
+        return float(retry_after)
+
+    try:
+        retry_date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
 
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+    return max((retry_date - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
 
-def get(url, headers=dict(), ok_statuses: tuple = tuple(), oneprovider_index: int = 0):
+
+def _get_timeout(timeout) -> tuple:
+    """
+    Returns (connect, read) timeout of request, limited by remaining time of the deadline of processed dataset.
+    If timeout is None, timeouts from configuration file are used.
+    """
+    if timeout is None:
+        timeout_config = Settings.get().config["restClient"]["timeout"]
+        timeout = (timeout_config["connect"], timeout_config["read"])
+    elif not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+
+    current_deadline = deadline.get_current()
+    if current_deadline is None:
+        return timeout
+
+    current_deadline.check()
+    remaining = current_deadline.remaining()
+    return min(timeout[0], remaining), min(timeout[1], remaining)
+
+
+def _sleep_before_retry(delay: float) -> None:
+    current_deadline = deadline.get_current()
+    if current_deadline is not None and delay >= current_deadline.remaining():
+        raise deadline.DeadlineExceeded(f"Time limit of {current_deadline.seconds} s for {current_deadline.name} "
+                                        f"would be exceeded before next retry")
+    time.sleep(delay)
+
+
+def _create_timeout_response(url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 408  # Request timeout https://developer.mozilla.org/en-US/docs/Web/HTTP/Status/408
+    response.url = url
+    response._content = b""
+    response._content_consumed = True
+    return response
+
+
+def _get_endpoint_semaphore(endpoint: str) -> threading.BoundedSemaphore:
+    """
+    Returns semaphore limiting number of requests sent concurrently to given endpoint (by all worker threads).
+    """
+    with _sessions_lock:
+        if endpoint not in _endpoint_semaphores:
+            max_requests = Settings.get().config["restClient"]["concurrency"]["maxRequestsPerEndpoint"]
+            _endpoint_semaphores[endpoint] = threading.BoundedSemaphore(max_requests)
+        return _endpoint_semaphores[endpoint]
+
+
+def _send_once(session: requests.Session, method: str, url: str, endpoint: str, headers, data, timeout,
+               stream: bool, ok_statuses: tuple):
+    timeout = _get_timeout(timeout)
+    rate_limiter.acquire(get_service_name(url, endpoint))
+    start = time.perf_counter()
+    try:
+        with _get_endpoint_semaphore(endpoint):
+            if cassette.is_replaying():
+                response = cassette.replay(method, url, endpoint, data)
+            else:
+                response = session.request(method, url, headers=headers, data=data, timeout=timeout,
+                                           stream=stream)
+    except requests.exceptions.RequestException:
+        request_metrics.record(method, url, endpoint, 0, time.perf_counter() - start, 0)
+        raise
+
+    if cassette.is_recording():
+        cassette.record(method, url, endpoint, data, response, time.perf_counter() - start)
+
+    # JSON body parsed for logging is reused by caller
+    response.__class__ = Response
+
+    # body of streamed response is not read yet
+    response_size = int(response.headers.get("Content-Length", 0)) if stream else len(response.content)
+    request_metrics.record(method, url, endpoint, response.status_code, time.perf_counter() - start, response_size,
+                           ok_statuses)
+    return response
+
+
+def _send_with_retries(session: requests.Session, method: str, url: str, endpoint: str, headers, data, timeout,
+                       retries: int, stream: bool, ok_statuses: tuple):
+    attempt = 0
+    while True:
+        try:
+            response = _send_once(session, method, url, endpoint, headers, data, timeout, stream, ok_statuses)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            # timeout could be shortened by deadline, it is not a failure of endpoint then
+            deadline.check_current()
+            if attempt >= retries:
+                raise
+            delay = get_retry_delay(attempt)
+            Logger.log(2, f"{method} {url} failed ({type(e).__name__}), retry {attempt + 1}/{retries} "
+                          f"in {delay:.1f} s")
+        else:
+            if attempt >= retries or not (response.status_code >= 500 or response.status_code == 429):
+                return response
+
+            delay = _get_retry_after(response)
+            if delay is None:
+                delay = get_retry_delay(attempt)
+            elif delay > Settings.get().config["restClient"]["retry"]["maxDelay"]:
+                Logger.log(2, f"{method} {url} can be retried after {delay:.0f} s, not retrying")
+                return response
+            Logger.log(2, f"{method} {url} returned {response.status_code}, retry {attempt + 1}/{retries} "
+                          f"in {delay:.1f} s")
+            # connection of streamed response is released back to pool
+            response.close()
+
+        _sleep_before_retry(delay)
+        attempt += 1
+
+
+def send(method: str, url: str, endpoint: str, headers: Optional[dict] = None, data=None, timeout=None,
+         retries: Optional[int] = None, stream: bool = False, ok_statuses: tuple = tuple()):
+    """
+    Sends request with given method to already processed (full) url using pooled session of given endpoint.
+    Requests failed on connection error, timeout, 5xx or 429 status code are sent again after backoff.
+    If retries is None, number of retries is taken from configuration file for idempotent methods
+    and non-idempotent methods are not retried.
+    If circuit breaker of endpoint is open, request is not sent and response with status code 503 is returned.
+    If timeout is None, connect and read timeouts from configuration file are used. Timeouts are shortened
+    to the remaining time of current deadline, DeadlineExceeded is raised when there is no time left.
+    If stream is True, body of response is not downloaded, response has to be closed by caller.
+    Status codes in ok_statuses are expected by caller, they are not counted as errors in request metrics.
+    """
+    if retries is None:
+        retries = Settings.get().config["restClient"]["retry"]["maxRetries"] if method.upper() in IDEMPOTENT_METHODS \
+            else 0
+
+    breaker = circuit_breaker.get_breaker(endpoint) if circuit_breaker.is_enabled() else None
+    if breaker is not None and not breaker.allow_request():
+        Logger.log(2, f"{method} {url} skipped, circuit breaker of {endpoint} is open")
+        return circuit_breaker.create_skipped_response(method, url, endpoint)
+
+    session = get_session(endpoint)
+    try:
+        response = _send_with_retries(session, method, url, endpoint, headers, data, timeout, retries, stream,
+                                      ok_statuses)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        if breaker is not None:
+            breaker.record_failure()
+        raise
+    except BaseException:
+        # e.g. DeadlineExceeded, it says nothing about the endpoint, but request let through has to be released
+        if breaker is not None:
+            breaker.release_probe()
+        raise
+
+    if breaker is not None:
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    return response
+
+
+def _journal_if_skipped(response, method: str, url: str) -> None:
+    """
+    Writes dataset which request (with not yet processed url) was skipped by circuit breaker to journal.
+    Skipped GET is journaled too, checks of the dataset based on it were not done.
+    """
+    if circuit_breaker.is_skipped(response):
+        circuit_breaker.journal_skipped_request(method, url)
+
+
+def get(url, headers=dict(), ok_statuses: tuple = tuple(), oneprovider_index: int = 0, use_cache: bool = True,
+        retries: Optional[int] = None):
+    """
+    Sends GET request. Response can be served from cache of current scan run,
+    use_cache should be False when the state of resource is polled.
+    """
+    endpoint = get_endpoint_name(url, oneprovider_index)
+    relative_url = url
+    if use_cache:
+        response = get_response_cache().get(endpoint, relative_url)
+        if response is not None:
+            Logger.log(5, f"Response to {relative_url} served from cache")
+            return response
+
+    # concurrent identical requests share one in-flight request and its response, requests of different
+    # priority classes are not shared, because the request waits for rate limiter with priority of its sender
+    key = (endpoint, relative_url, tuple(sorted(dict(headers).items())), rate_limiter.get_current_priority())
+    response = _in_flight_gets.do(
+        key, _send_get, relative_url, endpoint, headers, ok_statuses, oneprovider_index, use_cache, retries
+    )
+    # each caller sharing the response journals its own dataset
+    _journal_if_skipped(response, "GET", relative_url)
+    return response
+
+
+def _send_get(url: str, endpoint: str, headers, ok_statuses: tuple, oneprovider_index: int, use_cache: bool,
+              retries: Optional[int]):
+    relative_url = url
     url, headers = process_url(url, headers, oneprovider_index=oneprovider_index)
-    # TODO: maybe add to config
-    TIMEOUT_SECS = 10
+    # stored response is validated by server, it returns 304 without body if the resource did not change
+    http_cache = get_etag_cache()
+    if http_cache is not None:
+        cache_key = http_cache.get_key(url, headers)
+        headers = http_cache.add_validators(cache_key, headers)
+
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT_SECS)
+        response = send("GET", url, endpoint, headers=headers, retries=retries, ok_statuses=ok_statuses)
     except requests.exceptions.Timeout:
-        Logger.log(1, f"Request to {url} did not return in {TIMEOUT_SECS} seconds")
-        response = requests.Response()
-        response.status_code = 408  # Request timeout https://developer.mozilla.org/en-US/docs/Web/HTTP/Status/408
-        response._content = b""
-        return response
-
-    # commented because not ok is sometimes right response
-    # timeout_counter = 3
-    # while timeout_counter > 0:
-    #     response = requests.get(url, headers=headers, verify=False)
-    #     if response.ok:
-    #         timeout_counter = 0
-    #     else:
-    #         if Settings.get().debug >= 1: print("Warning: request timeouted", str(4-timeout_counter), "ouf of 3 times")
-    #         if Settings.get().debug >= 1: print("Warning: request url: ", url)
-    #         timeout_counter = timeout_counter - 1
-    #         time.sleep(10)
+        Logger.log(1, f"Request to {url} did not return in time")
+        return _create_timeout_response(url)
+
+    if http_cache is not None:
+        http_cache.record_transfer(endpoint, response)
+        response = http_cache.process_response(cache_key, endpoint, response)
+
     response_print(response, ok_statuses)
+    if use_cache:
+        get_response_cache().store(endpoint, relative_url, response)
     return response
 
 
-def patch(url, headers=dict(), data=dict(), oneprovider_index: int = 0):
+def iter_json_array(url, key: Optional[str] = None, headers=dict(), oneprovider_index: int = 0,
+                    other_fields: Optional[dict] = None, retries: Optional[int] = None) -> Iterator:
+    """
+    Sends GET request and yields items of JSON array from response as they are received, so the whole response
+    is never kept in memory. If key is None, response has to be an array, otherwise items of array under given key
+    of response object are yielded and other values of the object are stored to other_fields (if given).
+    Streamed responses are not cached. If response is not ok, nothing is yielded.
+    """
+    endpoint = get_endpoint_name(url, oneprovider_index)
+    relative_url = url
     url, headers = process_url(url, headers, oneprovider_index=oneprovider_index)
-    response = requests.patch(url, headers=headers, data=data)
+    try:
+        response = send("GET", url, endpoint, headers=headers, retries=retries, stream=True)
+    except requests.exceptions.Timeout:
+        Logger.log(1, f"Request to {url} did not return in time")
+        return
+    _journal_if_skipped(response, "GET", relative_url)
+
+    with response:
+        if not response.ok:
+            response_print(response)
+            return
+
+        Logger.log(4, "Requested URL: %s" % response.url)
+        Logger.log(4, "Response: %s (streamed)" % response)
+        streaming_config = Settings.get().config["restClient"]["streaming"]
+        yield from json_stream.iter_array(
+            response.iter_content(chunk_size=streaming_config["chunkSize"]), key, other_fields,
+            max_buffer_size=streaming_config["maxBufferSize"]
+        )
+
+
+def patch(url, headers=dict(), data=dict(), oneprovider_index: int = 0, retries: Optional[int] = None):
+    endpoint = get_endpoint_name(url, oneprovider_index)
+    get_response_cache().invalidate("PATCH", url)
+    full_url, full_headers = process_url(url, headers, oneprovider_index=oneprovider_index)
+    try:
+        response = send("PATCH", full_url, endpoint, headers=full_headers, data=data, retries=retries)
+    except requests.exceptions.Timeout:
+        Logger.log(1, f"PATCH request to {full_url} did not return in time")
+        return _create_timeout_response(full_url)
+    _journal_if_skipped(response, "PATCH", url)
     response_print(response)
     return response
 
 
-def put(url, headers=dict(), data=dict(), oneprovider_index: int = 0):
-    url, headers = process_url(url, headers, oneprovider_index=oneprovider_index)
-    response = requests.put(url, headers=headers, data=data)
+def put(url, headers=dict(), data=dict(), oneprovider_index: int = 0, retries: Optional[int] = None):
+    endpoint = get_endpoint_name(url, oneprovider_index)
+    get_response_cache().invalidate("PUT", url)
+    full_url, full_headers = process_url(url, headers, oneprovider_index=oneprovider_index)
+    try:
+        response = send("PUT", full_url, endpoint, headers=full_headers, data=data, retries=retries)
+    except requests.exceptions.Timeout:
+        Logger.log(1, f"PUT request to {full_url} did not return in time")
+        return _create_timeout_response(full_url)
+    _journal_if_skipped(response, "PUT", url)
     response_print(response)
     return response
 
 
-def post(url, headers=dict(), data=dict(), oneprovider_index: int = 0, ok_statuses: tuple = tuple()):
-    url, headers = process_url(url, headers, oneprovider_index=oneprovider_index)
-    response = requests.post(url, headers=headers, data=data)
+def post(url, headers=dict(), data=dict(), oneprovider_index: int = 0, ok_statuses: tuple = tuple(),
+         retries: Optional[int] = None):
+    endpoint = get_endpoint_name(url, oneprovider_index)
+    get_response_cache().invalidate("POST", url)
+    full_url, full_headers = process_url(url, headers, oneprovider_index=oneprovider_index)
+    try:
+        response = send("POST", full_url, endpoint, headers=full_headers, data=data, retries=retries,
+                        ok_statuses=ok_statuses)
+    except requests.exceptions.Timeout:
+        Logger.log(1, f"POST request to {full_url} did not return in time")
+        return _create_timeout_response(full_url)
+    _journal_if_skipped(response, "POST", url)
     response_print(response, ok_statuses)
     return response
 
 
-def delete(url, headers=dict(), data=dict(), oneprovider_index: int = 0, ok_statuses: tuple = tuple()):
-    url, headers = process_url(url, headers, oneprovider_index=oneprovider_index)
-    response = requests.delete(url, headers=headers, data=data)
+def delete(url, headers=dict(), data=dict(), oneprovider_index: int = 0, ok_statuses: tuple = tuple(),
+           retries: Optional[int] = None):
+    endpoint = get_endpoint_name(url, oneprovider_index)
+    get_response_cache().invalidate("DELETE", url)
+    full_url, full_headers = process_url(url, headers, oneprovider_index=oneprovider_index)
+    try:
+        response = send("DELETE", full_url, endpoint, headers=full_headers, data=data, retries=retries,
+                        ok_statuses=ok_statuses)
+    except requests.exceptions.Timeout:
+        Logger.log(1, f"DELETE request to {full_url} did not return in time")
+        return _create_timeout_response(full_url)
+    _journal_if_skipped(response, "DELETE", url)
     response_print(response, ok_statuses)
     return response
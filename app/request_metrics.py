@@ -0,0 +1,181 @@
+"""
+Metrics of requests sent to Onezone, Oneproviders, Onepanels and DAREG.
+Every sent request is recorded (regardless of verboseLevel) and at the end of the scan
+statistics for each endpoint are written to JSON file and to Prometheus textfile.
+"""
+import json
+import os
+import re
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+from settings import Settings
+from utils import Logger
+
+ID_PLACEHOLDER = "{id}"
+PATH_PLACEHOLDER = "{path}"
+PERCENTILES = (50, 95, 99)
+SERVICE_PREFIXES = ("onezone/", "oneprovider/", "onepanel/")
+
+# ids of Onedata objects (spaces, files, groups, tokens...) are long strings containing digits
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[A-Za-z0-9_\-=%.]{16,}$")
+_NUMBER_SEGMENT = re.compile(r"^\d+$")
+# after these segments the rest of url is path of file, not an id
+_PATH_SEGMENTS = ("lookup-file-id",)
+
+
+class _EndpointMetrics:
+    def __init__(self):
+        self.latencies: list = []
+        self.errors: int = 0
+        self.response_bytes: int = 0
+        self.status_codes: dict = {}
+
+
+_metrics: dict = {}
+_metrics_lock = threading.Lock()
+
+
+def get_url_template(url: str) -> str:
+    """
+    Returns url without host, query and ids, e.g. for url
+    https://zone.example.com/api/v3/onezone/spaces/1a2b3c4d5e6f7a8b9c0d?limit=5 returns onezone/spaces/{id}
+    """
+    path = urlparse(url).path
+    for prefix in SERVICE_PREFIXES:
+        position = path.find("/" + prefix)
+        if position != -1:
+            path = path[position + 1:]
+            break
+
+    segments = []
+    for segment in path.strip("/").split("/"):
+        if segments and segments[-1] in _PATH_SEGMENTS:
+            segments.append(PATH_PLACEHOLDER)
+            break
+        if _ID_SEGMENT.match(segment) or _NUMBER_SEGMENT.match(segment):
+            segments.append(ID_PLACEHOLDER)
+        else:
+            segments.append(segment)
+
+    return "/".join(segments)
+
+
+def record(method: str, url: str, endpoint: str, status_code: int, latency: float, response_size: int,
+           ok_statuses: tuple = tuple()) -> None:
+    """
+    Records one sent request. Status code 0 means that no response was received.
+    Status codes expected by caller (ok_statuses, e.g. 404 of existence check) are not counted as errors.
+    """
+    key = (endpoint, method.upper(), get_url_template(url))
+    with _metrics_lock:
+        metrics = _metrics.get(key)
+        if metrics is None:
+            metrics = _EndpointMetrics()
+            _metrics[key] = metrics
+
+        metrics.latencies.append(latency)
+        metrics.response_bytes += response_size
+        metrics.status_codes[status_code] = metrics.status_codes.get(status_code, 0) + 1
+        if status_code == 0 or (status_code >= 400 and status_code not in ok_statuses):
+            metrics.errors += 1
+
+
+def reset() -> None:
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _percentile(sorted_values: list, percentile: int) -> float:
+    """
+    Returns percentile of sorted values using nearest-rank method.
+    """
+    rank = -(-percentile * len(sorted_values) // 100)  # ceiling of division
+    return sorted_values[max(rank, 1) - 1]
+
+
+def get_summary() -> list:
+    """
+    Returns list of statistics for each endpoint (provider, method and url template), slowest first.
+    """
+    summary = []
+    with _metrics_lock:
+        for (endpoint, method, url_template), metrics in _metrics.items():
+            latencies = sorted(metrics.latencies)
+            count = len(latencies)
+            statistics = {
+                "endpoint": endpoint,
+                "method": method,
+                "url": url_template,
+                "count": count,
+                "errors": metrics.errors,
+                "error_rate": metrics.errors / count,
+                "latency_sum": sum(latencies),
+                "response_bytes": metrics.response_bytes,
+                "status_codes": {str(code): number for code, number in sorted(metrics.status_codes.items())},
+            }
+            for percentile in PERCENTILES:
+                statistics[f"p{percentile}"] = _percentile(latencies, percentile)
+            summary.append(statistics)
+
+    summary.sort(key=lambda item: item["latency_sum"], reverse=True)
+    return summary
+
+
+def _write_file(path: str, content: str) -> None:
+    # textfile collectors can read the file anytime, so it is replaced at once
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(temporary_path, path)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _to_prometheus(summary: list) -> str:
+    lines = [
+        "# HELP fs2od_api_request_duration_seconds Latency of requests sent by fs2od.",
+        "# TYPE fs2od_api_request_duration_seconds summary",
+    ]
+    for statistics in summary:
+        labels = f'endpoint="{_escape_label(statistics["endpoint"])}",method="{statistics["method"]}",' \
+                 f'url="{_escape_label(statistics["url"])}"'
+        for percentile in PERCENTILES:
+            lines.append(f'fs2od_api_request_duration_seconds{{{labels},quantile="{percentile / 100}"}} '
+                         f'{statistics[f"p{percentile}"]:.6f}')
+        lines.append(f"fs2od_api_request_duration_seconds_sum{{{labels}}} {statistics['latency_sum']:.6f}")
+        lines.append(f"fs2od_api_request_duration_seconds_count{{{labels}}} {statistics['count']}")
+
+    for name, key, help_text in (
+        ("fs2od_api_errors_total", "errors", "Requests which failed or returned error status code."),
+        ("fs2od_api_response_bytes_total", "response_bytes", "Size of received response bodies."),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for statistics in summary:
+            labels = f'endpoint="{_escape_label(statistics["endpoint"])}",method="{statistics["method"]}",' \
+                     f'url="{_escape_label(statistics["url"])}"'
+            lines.append(f"{name}{{{labels}}} {statistics[key]}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_reports(summary: Optional[list] = None) -> None:
+    """
+    Writes statistics of requests to files given in configuration file.
+    """
+    metrics_config = Settings.get().config["restClient"]["metrics"]
+    if summary is None:
+        summary = get_summary()
+
+    try:
+        if metrics_config["jsonFile"]:
+            _write_file(metrics_config["jsonFile"], json.dumps(summary, indent=2) + "\n")
+            Logger.log(4, f"Request metrics written to {metrics_config['jsonFile']}")
+        if metrics_config["prometheusFile"]:
+            _write_file(metrics_config["prometheusFile"], _to_prometheus(summary))
+            Logger.log(4, f"Request metrics written to {metrics_config['prometheusFile']}")
+    except OSError as e:
+        Logger.log(2, f"Request metrics could not be written: {e}")
@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Optional
+from settings import Settings
+from utils import Logger
+
+# prefixes of urls which are removed to get path of the resource, the same resource (e.g. a space) then has
+# the same path on Onezone, Oneprovider and Onepanel
+SERVICE_PREFIXES = ("onepanel/provider/", "onepanel/", "oneprovider/", "onezone/")
+
+
+def get_resource_path(url: str) -> str:
+    """
+    Returns path of the resource without service prefix and query string, e.g. for url
+    onepanel/provider/spaces/123/storage-import/auto/info?x=y returns spaces/123/storage-import/auto/info
+    """
+    path = url.split("?", 1)[0].strip("/")
+    for prefix in SERVICE_PREFIXES:
+        if path.startswith(prefix):
+            return path[len(prefix):]
+
+    return path
+
+
+def _is_same_or_descendant(path: str, ancestor: str) -> bool:
+    return path == ancestor or path.startswith(ancestor + "/")
+
+
+class ResponseCache:
+    """
+    Cache of responses to GET requests which lives for one scan run.
+    Entries are keyed by endpoint (Onezone or index of Oneprovider) and url and expire after given time.
+    """
+    def __init__(self):
+        self.enabled: bool = False
+        self.ttl: float = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Starts caching for a new scan run, if enabled in configuration file.
+        """
+        cache_config = Settings.get().config["restClient"]["responseCache"]
+        with self._lock:
+            self._entries = {}
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+            self.ttl = cache_config["ttl"]
+            self.enabled = cache_config["enabled"]
+
+    def stop(self) -> None:
+        """
+        Stops caching and forgets all stored responses. Statistics are kept.
+        """
+        with self._lock:
+            self.enabled = False
+            self._entries = {}
+
+    def get(self, endpoint: str, url: str):
+        """
+        Returns stored response for given endpoint and url or None when there is no valid response stored.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get((endpoint, url))
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop((endpoint, url), None)
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[1]
+
+    def store(self, endpoint: str, url: str, response) -> None:
+        """
+        Stores successful response to GET request.
+        """
+        if not self.enabled or not response.ok:
+            return
+
+        with self._lock:
+            self._entries[(endpoint, url)] = (time.monotonic() + self.ttl, response)
+
+    def invalidate(self, method: str, url: str) -> None:
+        """
+        Removes stored responses affected by mutating request (PATCH, PUT, POST, DELETE) to given url.
+        These are responses for the same resource, its subresources and collections containing it (on any endpoint).
+        POST request usually creates a new subresource or runs an action, so the parent of url is the changed resource.
+        """
+        if not self.enabled:
+            return
+
+        changed_path = get_resource_path(url)
+        if method.upper() == "POST" and "/" in changed_path:
+            changed_path = changed_path.rsplit("/", 1)[0]
+
+        with self._lock:
+            for key in list(self._entries.keys()):
+                cached_path = get_resource_path(key[1])
+                if _is_same_or_descendant(cached_path, changed_path) \
+                        or _is_same_or_descendant(changed_path, cached_path):
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def log_statistics(self) -> None:
+        requests_count = self.hits + self.misses
+        if requests_count == 0:
+            return
+
+        Logger.log(3, f"Response cache: {self.hits} hits, {self.misses} misses "
+                      f"(hit ratio {self.hits / requests_count:.1%}), {self.invalidations} invalidated entries")
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+
+    return _response_cache
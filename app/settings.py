@@ -356,6 +356,8 @@ class Settings:
         self._test_existence(self.config["fs2odMetadataFile"], "filename", ".fs2od", parent_name="fs2odMetadataFile")
         self._test_if_empty(self.config["fs2odMetadataFile"], "filename", parent_name="fs2odMetadataFile")
         self._test_existence(self.config["fs2odMetadataFile"], "storeAccessInfo", True, parent_name="fs2odMetadataFile")
+        self._test_existence(self.config["fs2odMetadataFile"], "lastProgramRunInterval", 24,
+                             parent_name="fs2odMetadataFile")
 
         self._test_existence(self.config, "institutionName")
         self._test_existence(self.config, "datasetPrefix", "")
@@ -367,6 +369,22 @@ class Settings:
         self._test_existence(self.config, "testModePrefix", "test_fs2od")
         self._test_existence(self.config, "sleepFactor", 2)
 
+        self._test_existence(self.config, "datasetProcessing", dict())
+        self._test_existence(self.config["datasetProcessing"], "workers", 4, parent_name="datasetProcessing")
+
+        self._test_existence(self.config, "stateIndex", dict())
+        self._test_existence(self.config["stateIndex"], "enabled", True, parent_name="stateIndex")
+        self._test_existence(self.config["stateIndex"], "path", "state_index.sqlite", parent_name="stateIndex")
+        self._test_existence(self.config["stateIndex"], "recheckInterval", 24, parent_name="stateIndex")
+
+        self._test_existence(self.config, "yamlCache", dict())
+        self._test_existence(self.config["yamlCache"], "enabled", True, parent_name="yamlCache")
+        self._test_existence(self.config["yamlCache"], "maxEntries", 4096, parent_name="yamlCache")
+
+        self._test_existence(self.config, "watch", dict())
+        self._test_existence(self.config["watch"], "settleTime", 2, parent_name="watch")
+        self._test_existence(self.config["watch"], "resyncInterval", 3600, parent_name="watch")
+
         self._test_existence(self.config, "continousFileImport", dict())
         self._test_existence(self.config["continousFileImport"], "enabled", True)
         self._test_existence(self.config["continousFileImport"], "runningFileName", ".running")
@@ -390,6 +408,102 @@ class Settings:
         self._test_existence(self.config["dareg"], "token", "a_secret_token")
         self._test_existence(self.config["dareg"], "origin_instance_pk", 1)
 
+        self._test_existence(self.config, "restClient", dict())
+        self._test_existence(self.config["restClient"], "connectionPool", dict())
+        self._test_existence(
+            self.config["restClient"]["connectionPool"], "poolSize", 10, parent_name="restClient->connectionPool")
+        self._test_existence(
+            self.config["restClient"]["connectionPool"], "keepAlive", True, parent_name="restClient->connectionPool")
+        self._test_existence(
+            self.config["restClient"]["connectionPool"], "prewarm", 1, parent_name="restClient->connectionPool")
+        self._test_existence(self.config["restClient"], "concurrency", dict())
+        self._test_existence(
+            self.config["restClient"]["concurrency"], "maxRequestsPerEndpoint", 16,
+            parent_name="restClient->concurrency")
+        if self.config["restClient"]["concurrency"]["maxRequestsPerEndpoint"] < 1:
+            self._failed("maxRequestsPerEndpoint of restClient->concurrency must be positive")
+
+        self._test_existence(self.config["restClient"], "transport", "sync", parent_name="restClient")
+        if self.config["restClient"]["transport"] not in ("sync", "asyncio"):
+            self._failed("transport of restClient must be one of sync, asyncio")
+        self._test_existence(self.config["restClient"], "asyncio", dict())
+        self._test_existence(
+            self.config["restClient"]["asyncio"], "maxConcurrencyPerProvider", 16, parent_name="restClient->asyncio")
+        self._test_existence(self.config["restClient"], "responseCache", dict())
+        self._test_existence(
+            self.config["restClient"]["responseCache"], "enabled", True, parent_name="restClient->responseCache")
+        self._test_existence(
+            self.config["restClient"]["responseCache"], "ttl", 60, parent_name="restClient->responseCache")
+        self._test_existence(self.config["restClient"], "timeout", dict())
+        self._test_existence(self.config["restClient"]["timeout"], "connect", 5, parent_name="restClient->timeout")
+        self._test_existence(self.config["restClient"]["timeout"], "read", 30, parent_name="restClient->timeout")
+        self._test_existence(
+            self.config["restClient"]["timeout"], "datasetDeadline", 1800, parent_name="restClient->timeout")
+        self._test_existence(self.config["restClient"], "retry", dict())
+        self._test_existence(self.config["restClient"]["retry"], "maxRetries", 4, parent_name="restClient->retry")
+        self._test_existence(self.config["restClient"]["retry"], "baseDelay", 0.5, parent_name="restClient->retry")
+        self._test_existence(self.config["restClient"]["retry"], "maxDelay", 30, parent_name="restClient->retry")
+        self._test_existence(self.config["restClient"], "circuitBreaker", dict())
+        self._test_existence(
+            self.config["restClient"]["circuitBreaker"], "enabled", True, parent_name="restClient->circuitBreaker")
+        self._test_existence(
+            self.config["restClient"]["circuitBreaker"], "failureThreshold", 5,
+            parent_name="restClient->circuitBreaker"
+        )
+        self._test_existence(
+            self.config["restClient"]["circuitBreaker"], "resetTimeout", 60, parent_name="restClient->circuitBreaker")
+        self._test_existence(
+            self.config["restClient"]["circuitBreaker"], "journalFile", "skipped_requests.jsonl",
+            parent_name="restClient->circuitBreaker"
+        )
+        self._test_existence(self.config["restClient"], "rateLimit", dict())
+        self._test_existence(
+            self.config["restClient"]["rateLimit"], "enabled", True, parent_name="restClient->rateLimit")
+        default_limits = (("onezone", 20, 40), ("oneprovider", 20, 40), ("onepanel", 10, 20), ("dareg", 5, 10))
+        for service, rate, burst in default_limits:
+            self._test_existence(self.config["restClient"]["rateLimit"], service, dict())
+            self._test_existence(
+                self.config["restClient"]["rateLimit"][service], "rate", rate,
+                parent_name=f"restClient->rateLimit->{service}"
+            )
+            self._test_existence(
+                self.config["restClient"]["rateLimit"][service], "burst", burst,
+                parent_name=f"restClient->rateLimit->{service}"
+            )
+            if self.config["restClient"]["rateLimit"][service]["rate"] <= 0:
+                self._failed(f"rate of restClient->rateLimit->{service} must be positive")
+        self._test_existence(self.config["restClient"], "etagCache", dict())
+        self._test_existence(
+            self.config["restClient"]["etagCache"], "enabled", True, parent_name="restClient->etagCache")
+        self._test_existence(
+            self.config["restClient"]["etagCache"], "path", "etag_cache.sqlite", parent_name="restClient->etagCache")
+        self._test_existence(self.config["restClient"]["etagCache"], "maxAge", 7, parent_name="restClient->etagCache")
+        self._test_existence(self.config["restClient"], "streaming", dict())
+        self._test_existence(
+            self.config["restClient"]["streaming"], "chunkSize", 65536, parent_name="restClient->streaming")
+        self._test_existence(
+            self.config["restClient"]["streaming"], "maxBufferSize", 1048576, parent_name="restClient->streaming")
+        self._test_existence(self.config["restClient"], "cassette", dict())
+        self._test_existence(self.config["restClient"]["cassette"], "mode", "off", parent_name="restClient->cassette")
+        if self.config["restClient"]["cassette"]["mode"] not in ("off", "record", "replay"):
+            self._failed("mode of restClient->cassette must be one of off, record, replay")
+        self._test_existence(
+            self.config["restClient"]["cassette"], "path", "cassette.jsonl.gz", parent_name="restClient->cassette")
+        self._test_existence(
+            self.config["restClient"]["cassette"], "latencyScale", 1.0, parent_name="restClient->cassette")
+        self._test_existence(self.config["restClient"], "logging", dict())
+        self._test_existence(
+            self.config["restClient"]["logging"], "bodySampleRate", 1.0, parent_name="restClient->logging")
+        self._test_existence(
+            self.config["restClient"]["logging"], "maxBodySize", 65536, parent_name="restClient->logging")
+        self._test_existence(self.config["restClient"], "metrics", dict())
+        self._test_existence(
+            self.config["restClient"]["metrics"], "jsonFile", "request_metrics.json", parent_name="restClient->metrics")
+        self._test_existence(
+            self.config["restClient"]["metrics"], "prometheusFile", "request_metrics.prom",
+            parent_name="restClient->metrics"
+        )
+
         self._test_existence(self.config, "restAccess")
         self._test_existence(self.config["restAccess"], "onezone")
         self._test_existence(self.config["restAccess"]["onezone"], "host", parent_name="onezone")
@@ -81,7 +81,8 @@ def get_share_starting_with(space_id: str, text: str) -> str:
     """
     Logger.log(4, f"get_share_starting_with(sid={space_id},share_name={text})")
 
-    shares = spaces.get_space_shares(space_id)
+    # shares are polled until the new one is propagated to Onezone
+    shares = spaces.get_space_shares(space_id, use_cache=False)
     if not shares:
         return ""
 
@@ -106,7 +107,7 @@ def create_share_description(directory: Union[os.DirEntry, str], ignore_config_p
     Otherwise returns tuple with two empty strings
     """
     Logger.log(4, f"create_share_description({directory})")
-    if type(directory) != os.DirEntry:
+    if isinstance(directory, str):
         # hack to get DirEntry
         directory = filesystem.get_dir_entry_of_directory(directory)
 
@@ -142,7 +143,9 @@ def create_share_description(directory: Union[os.DirEntry, str], ignore_config_p
         if share_id:
             break
 
-        time.sleep(Settings.get().config["sleepFactor"] * 2)
+        # share is being propagated to Onezone, not a failure of request, so it is not retried by request layer
+        # propagation takes some time, so jitter only prolongs the original fixed wait
+        time.sleep(Settings.get().config["sleepFactor"] * (2 + request.get_retry_delay(try_number)))
 
     if not share_id:
         return "", ""
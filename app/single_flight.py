@@ -0,0 +1,61 @@
+"""
+Deduplication of concurrent identical calls. While a call with some key is running, other threads asking
+for the same key do not start their own call, they wait for the running one and receive its result.
+Exceptions given as not_shared (e.g. exceeded deadline of the caller) are raised only to the caller who made
+the call, threads waiting for it make the call again.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    def __init__(self, not_shared: tuple = ()):
+        self.not_shared = not_shared
+        self.coalesced: int = 0
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Calls function with given arguments, unless a call with the same key is already running.
+        In that case waits for the running call and returns its result (or raises its exception).
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                is_leader = call is None
+                if is_leader:
+                    call = _Call()
+                    self._calls[key] = call
+                else:
+                    self.coalesced += 1
+
+            if is_leader:
+                break
+
+            call.done.wait()
+            if isinstance(call.exception, self.not_shared):
+                # the call failed for reason of the caller who made it, this thread tries it on its own
+                with self._lock:
+                    self.coalesced -= 1
+                continue
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -1,12 +1,13 @@
 import json
 import os
 import time
+from typing import Iterator
 import storages
 import filesystem
 import shares
 from settings import Settings
 from utils import Logger, Utils
-import request, tokens, files, metadata, dareg
+import request, rate_limiter, tokens, files, metadata, dareg
 
 """
 Minimal size of a space. Smaller size cause "badValueTooLow" error on Oneprovder. 
@@ -24,6 +25,15 @@ def get_all_user_spaces() -> dict:
     return response.json()
 
 
+def iter_all_user_spaces() -> Iterator[dict]:
+    """
+    Streaming variant of get_all_user_spaces(), yields spaces one by one as they are received.
+    """
+    Logger.log(4, f"iter_all_user_spaces()")
+    url = f"oneprovider/spaces"
+    yield from request.iter_json_array(url)
+
+
 def get_all_provider_spaces(oneprovider_index: int = 0) -> dict:
     Logger.log(4, f"get_all_provider_spaces(order={oneprovider_index}):")
     # https://onedata.org/#/home/api/stable/oneprovider?anchor=operation/get_all_spaces
@@ -41,8 +51,7 @@ def get_all_provider_spaces_with_names(oneprovider_index: int = 0) -> dict[str,
     if "error" in space_ids:
         return {}
 
-    user_spaces_with_names = get_all_user_spaces()
-    spaces_names = {space["spaceId"]: space["name"] for space in user_spaces_with_names}
+    spaces_names = {space["spaceId"]: space["name"] for space in iter_all_user_spaces()}
     space_ids = space_ids["ids"]
 
     spaces = {key: spaces_names[key] for key in space_ids if key in spaces_names}
@@ -79,7 +88,7 @@ def get_space(space_id: str, ok_statuses: tuple = (200,), oneprovider_index: int
         return {}
 
 
-def get_space_shares(space_id: str) -> list:
+def get_space_shares(space_id: str, use_cache: bool = True) -> list:
     """
     Returns list of space shares (their ids)
     If any error occurred, returns empty list
@@ -87,7 +96,7 @@ def get_space_shares(space_id: str) -> list:
     Logger.log(4, f"get_space_shares({space_id})")
     # https://onedata.org/#/home/api/stable/onezone?anchor=operation/list_space_shares
     url = "onezone/spaces/" + space_id + "/shares"
-    response = request.get(url)
+    response = request.get(url, use_cache=use_cache)
 
     if not response.ok:
         Logger.log(1, f"Shares for space with id {space_id} could not be retrieved")
@@ -149,17 +158,17 @@ def get_space_from_onezone(space_id) -> dict:
 
 def get_space_id_by_name(name: str) -> str:
     Logger.log(4, f"get_space_id_by_name({name}):")
-    for space in get_all_user_spaces():
+    for space in iter_all_user_spaces():
         if space["name"].startswith(name):
             return space["spaceId"]
     return ""
 
 
-def getSpaceDetails(space_id, oneprovider_index: int = 0):
+def getSpaceDetails(space_id, oneprovider_index: int = 0, use_cache: bool = True):
     Logger.log(4, f"getSpaceDetails(space_id={space_id},op_index={oneprovider_index})")
     # https://onedata.org/#/home/api/stable/onepanel?anchor=operation/get_space_details
     url = "onepanel/provider/spaces/" + space_id
-    response = request.get(url, oneprovider_index=oneprovider_index)
+    response = request.get(url, oneprovider_index=oneprovider_index, use_cache=use_cache)
 
     # not supported, non-existent or forbidden
     if not response.ok:
@@ -187,7 +196,8 @@ def getAutoStorageImportInfo(space_id) -> dict:
     Logger.log(4, "getAutoStorageImportInfo(%s):" % space_id)
     # https://onedata.org/#/home/api/stable/onepanel?anchor=operation/get_auto_storage_import_info
     url = "onepanel/provider/spaces/" + space_id + "/storage-import/auto/info"
-    response = request.get(url)
+    # status of import is polled, so it cannot be cached
+    response = request.get(url, use_cache=False)
 
     if not response.ok:
         Logger.log(3, f"Cannot obtain info about storage import for space {space_id}")
@@ -319,7 +329,8 @@ def setSpaceSize(space_id, size=None):
     Logger.log(4, "setSpaceSize(%s, %s):" % (space_id, str(size)))
     # if size not set, get spaceOccupancy
     if not size:
-        sd = getSpaceDetails(space_id)
+        # occupancy changes during import of files
+        sd = getSpaceDetails(space_id, use_cache=False)
         size = sd["spaceOccupancy"]
 
     # fix space size if it is too small
@@ -352,7 +363,7 @@ def setSpaceSize(space_id, size=None):
                 2, "New size (%s) can't be set for storage of provider %s of space %s" % (
                 size, provider_domain_name, space_id), space_id=space_id
             )
-        time.sleep(1 * Settings.get().config["sleepFactor"])
+        rate_limiter.sleep_for_backpressure(1)
     return response
 
 
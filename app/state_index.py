@@ -0,0 +1,168 @@
+"""
+Persistent index of datasets found in watched directories and their state in Onedata (SQLite database).
+For each dataset, the fingerprint of its directory (inode, size and modification time of metadata files,
+presence of running file) is stored after it was successfully processed. Dataset with the same fingerprint
+is not processed again until recheckInterval passes, so scan of finished datasets sends no requests.
+Changes made only in Onedata (e.g. removed space) are therefore found at latest after recheckInterval.
+Time of the last processing of dataset is stored here too, metadata file gets it only once in a while.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+import dataset_dir
+from settings import Settings
+from utils import Logger
+
+# columns describing files of dataset, dataset is processed again when any of them changes
+FINGERPRINT_COLUMNS = ("inode", "trigger_mtime_ns", "trigger_size", "metadata_mtime_ns", "metadata_size",
+                       "continuous_import")
+STATE_COLUMNS = ("space_id", "storage_id", "group_id", "share_id", "removal_state", "last_program_run")
+# removal states of datasets which do not need any further action
+FINAL_REMOVAL_STATES = ("", "never", "removed")
+
+
+class StateIndex:
+    def __init__(self, path: str, recheck_interval: float):
+        self.path = path
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self.statistics = {"skipped": 0, "processed": 0}
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS datasets (path TEXT PRIMARY KEY, inode INTEGER, "
+                "trigger_mtime_ns INTEGER, trigger_size INTEGER, metadata_mtime_ns INTEGER, metadata_size INTEGER, "
+                "continuous_import INTEGER, space_id TEXT, storage_id TEXT, group_id TEXT, share_id TEXT, "
+                "removal_state TEXT, last_checked REAL, last_program_run TEXT)"
+            )
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(datasets)")}
+            if "last_program_run" not in columns:
+                # index created by older version
+                self._connection.execute("ALTER TABLE datasets ADD COLUMN last_program_run TEXT")
+            self._connection.commit()
+
+        return self._connection
+
+    def get(self, path: str) -> Optional[dict]:
+        """
+        Returns stored state of dataset in given directory or None if it is not in index.
+        """
+        with self._lock:
+            cursor = self._get_connection().execute("SELECT * FROM datasets WHERE path = ?", (path,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return {column[0]: value for column, value in zip(cursor.description, row)}
+
+    def is_unchanged(self, path: str, fingerprint: dict) -> bool:
+        """
+        Returns True if dataset was processed with the same fingerprint recently and it does not wait for removal,
+        so it does not have to be processed again.
+        """
+        state = self.get(path)
+        unchanged = (
+            state is not None
+            and all(state[column] == fingerprint[column] for column in FINGERPRINT_COLUMNS)
+            and (state["removal_state"] or "") in FINAL_REMOVAL_STATES
+            and time.time() - state["last_checked"] < self.recheck_interval
+        )
+        with self._lock:
+            self.statistics["skipped" if unchanged else "processed"] += 1
+        return unchanged
+
+    def update(self, path: str, fingerprint: Optional[dict] = None, **state) -> None:
+        """
+        Stores fingerprint (when given, it also marks the dataset as checked now) and given state columns
+        of dataset. Columns which are not given (or are None) keep their stored values.
+        """
+        values = {column: value for column, value in state.items() if column in STATE_COLUMNS and value is not None}
+        if fingerprint is not None:
+            values.update({column: fingerprint[column] for column in FINGERPRINT_COLUMNS})
+            values["last_checked"] = time.time()
+
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("INSERT OR IGNORE INTO datasets (path, last_checked) VALUES (?, 0)", (path,))
+            if values:
+                assignments = ", ".join(f"{column} = ?" for column in values)
+                connection.execute(f"UPDATE datasets SET {assignments} WHERE path = ?", (*values.values(), path))
+            connection.commit()
+
+    def forget(self, path: str) -> None:
+        """
+        Removes dataset from index, so it is processed in the next scan.
+        """
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("DELETE FROM datasets WHERE path = ?", (path,))
+            connection.commit()
+
+    def forget_missing(self, base_path: str, existing_paths: set) -> None:
+        """
+        Removes datasets in given watched directory which do not exist anymore.
+        """
+        prefix = base_path.rstrip(os.sep) + os.sep
+        with self._lock:
+            connection = self._get_connection()
+            rows = connection.execute("SELECT path FROM datasets WHERE substr(path, 1, ?) = ?",
+                                      (len(prefix), prefix)).fetchall()
+            missing = [(path,) for path, in rows if path not in existing_paths]
+            if missing:
+                connection.executemany("DELETE FROM datasets WHERE path = ?", missing)
+                connection.commit()
+                Logger.log(4, f"{len(missing)} removed datasets in {base_path} removed from state index")
+
+    def log_statistics(self) -> None:
+        with self._lock:
+            if self.statistics["skipped"] or self.statistics["processed"]:
+                Logger.log(3, f"State index: {self.statistics['skipped']} unchanged datasets skipped, "
+                              f"{self.statistics['processed']} datasets processed")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def get_fingerprint(snapshot: dataset_dir.DatasetDirSnapshot, trigger_file: str) -> dict:
+    """
+    Returns fingerprint of dataset directory with given trigger metadata file.
+    """
+    trigger_stat = snapshot.stat(trigger_file)
+    metadata_stat = snapshot.stat(snapshot.get_separate_metadata_file())
+
+    return {
+        "inode": snapshot.inode(),
+        "trigger_mtime_ns": trigger_stat.st_mtime_ns if trigger_stat else None,
+        "trigger_size": trigger_stat.st_size if trigger_stat else None,
+        "metadata_mtime_ns": metadata_stat.st_mtime_ns if metadata_stat else None,
+        "metadata_size": metadata_stat.st_size if metadata_stat else None,
+        "continuous_import": int(Settings.get().config["continousFileImport"]["enabled"]
+                                 and snapshot.has_running_file()),
+    }
+
+
+_state_index: Optional[StateIndex] = None
+_state_index_lock = threading.Lock()
+
+
+def get_state_index() -> Optional[StateIndex]:
+    """
+    Returns state index or None if it is disabled in configuration file.
+    """
+    global _state_index
+    index_config = Settings.get().config["stateIndex"]
+    if not index_config["enabled"]:
+        return None
+
+    with _state_index_lock:
+        if _state_index is None:
+            _state_index = StateIndex(index_config["path"], index_config["recheckInterval"] * 3600)
+
+    return _state_index
@@ -1,11 +1,14 @@
 import datetime
 import os
+import dataset_dir
 import filesystem
 import files
 import time
 import spaces
 import oneprovider
 import transfers
+import rate_limiter
+import state_index
 import workflow
 from utils import Logger, Settings, Utils
 
@@ -23,13 +26,13 @@ def _remove_running_file_if_existent(space_id: str, directory: os.DirEntry) -> b
         directory,
         Settings.get().config["continousFileImport"]["runningFileName"]
     )
-    if not os.path.isfile(continuous_file_import_file):
+    if not dataset_dir.get_snapshot(directory).has_running_file():
         return False
 
     Logger.log(4, f"Running file in {directory.path} found. Removing it and disabling auto continuous import. "
                   f"Removing this dataset will be done in the next run.")
     try:
-        os.remove(continuous_file_import_file)
+        filesystem.remove_file(continuous_file_import_file)
     except Exception:
         Logger.log(4, f"Running file in directory {directory.path} could not be removed. "
                       f"To preserve data complete, removing will no execute.")
@@ -55,11 +58,12 @@ def _wait_for_transfers_to_complete(space_id: str, transfers_ids: list) -> bool:
         time.sleep(15 * Settings.get().config["sleepFactor"])
         Logger.log(5, f"Checking for completed transfers, try {try_index + 1}/{MAX_TRANSFER_COMPLETED_CHECKS}.")
 
+        status_dicts = transfers.get_transfer_statuses(
+            transfer_ids=transfers_ids,
+            status_type_if_not_found="replicationStatus"
+        )
         for transfer_index in range(len(transfers_ids) - 1, -1, -1):  # going down for easier removal from list
-            status_dict = transfers.get_transfer_status(
-                transfer_id=transfers_ids[transfer_index],
-                status_type_if_not_found="replicationStatus"
-            )
+            status_dict = status_dicts[transfer_index]
 
             # transfer should be here, because was created few seconds ago. If not, internal error
             if not status_dict or "replicationStatus" not in status_dict:
@@ -171,7 +175,7 @@ def _sync_information_about_space_removal(space_id: str, directory: os.DirEntry)
 
         # thinking about situation, when will not be removed from filesystem, but we need to keep the system integrity
         if completed:
-            os.remove(yaml_trigger_file)
+            filesystem.remove_file(yaml_trigger_file)
 
         return completed
 
@@ -183,7 +187,7 @@ def _sync_information_about_space_removal(space_id: str, directory: os.DirEntry)
         valueType="RemovingTime",
         value="removed"
     )
-    time.sleep(1 * Settings.get().config["sleepFactor"])
+    rate_limiter.sleep_for_backpressure(1)
 
     denied_providers_list = filesystem.get_token_from_yaml(yaml_metadata_dict, "deniedProviders", [])
     if "primary" in denied_providers_list:
@@ -233,7 +237,7 @@ def _sync_information_about_space_removal(space_id: str, directory: os.DirEntry)
             valueType="RemovingTime",
             value="removed"
         )
-        time.sleep(1 * Settings.get().config["sleepFactor"])
+        rate_limiter.sleep_for_backpressure(1)
 
     return completed
 
@@ -266,20 +270,32 @@ def remove_support_primary_NOW(space_id: str, directory: os.DirEntry) -> bool:
 def remove_support_primary(space_id: str, yaml_file_path: str, directory: os.DirEntry):
     Logger.log(4, f"remove_support_primary(space_id={space_id}, yaml_path={yaml_file_path}, "
                   f"directory_path={directory.path})")
+    index = state_index.get_state_index()
+    indexed_state = index.get(directory.path) if index is not None else None
+    if indexed_state is not None and indexed_state["removal_state"] == "removed":
+        Logger.log(4, f"Support of primary provider for space with id {space_id} was already revoked")
+        return
+
     time_default = datetime.datetime(1900, 1, 1)
     time_now = datetime.datetime.now()
     email_sent = False
 
     yaml_dict = filesystem.load_yaml(yaml_file_path)
-    last_program_run_time = filesystem.get_token_from_yaml(yaml_dict, "lastProgramRun", None)
-
-    if not last_program_run_time:
-        last_program_run_time = time_default
-    else:
+    # metadata file has the time of the last run only with granularity of lastProgramRunInterval
+    last_program_run_times = [filesystem.get_token_from_yaml(yaml_dict, "lastProgramRun", None)]
+    if indexed_state is not None:
+        last_program_run_times.append(indexed_state["last_program_run"])
+
+    last_program_run_time = time_default
+    for value in last_program_run_times:
+        if not value:
+            continue
         try:
-            last_program_run_time = datetime.datetime.fromisoformat(last_program_run_time)
-        except ValueError:
-            last_program_run_time = time_default
+            if not isinstance(value, datetime.datetime):
+                value = datetime.datetime.fromisoformat(value)
+            last_program_run_time = max(last_program_run_time, value)
+        except (TypeError, ValueError):
+            pass
 
     removing_time = filesystem.get_token_from_yaml(yaml_dict, "removingTime", None)
 
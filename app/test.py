@@ -2,12 +2,14 @@ import argparse
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 import dareg
 import groups
 import mail
 import oneprovider
 import onezone
+import request
 import spaces
 import storages
 import tokens
@@ -126,10 +128,8 @@ def get_requested_instances_from_onezone(arguments: Arguments) -> List[tuple]:
         Logger.log(1, f"Provider with hostname or id {arguments.provider} not found")
         return []
 
-    provider_spaces = onezone.get_providers_supported_spaces_from_onezone(provider_id)
-
     available_spaces = []
-    for provider_space_id in provider_spaces:
+    for provider_space_id in onezone.iter_providers_supported_spaces_from_onezone(provider_id):
         space_details = spaces.get_space_from_onezone(provider_space_id)
         if not space_details:
             continue
@@ -147,7 +147,7 @@ def get_requested_instances_from_onezone(arguments: Arguments) -> List[tuple]:
 
 def get_tokens_starting_with(arguments: Arguments) -> List[tuple]:
     wanted_instances = []
-    for token_id in tokens.list_all_named_tokens():
+    for token_id in tokens.iter_all_named_tokens():
         token = tokens.getNamedToken(token_id)
         if not token["name"].startswith(arguments.starting_with):
             continue
@@ -185,7 +185,7 @@ def get_all_users_groups_starting_with(arguments: Arguments) -> List[tuple]:
 
 def get_only_groups_under_spaces_starting_with(arguments: Arguments) -> List[tuple]:
     wanted_instances = []
-    for space in spaces.get_all_user_spaces():
+    for space in spaces.iter_all_user_spaces():
         if "spaceId" not in space:
             Logger.log(4, "Space has no element spaceId. Skipping")
             continue
@@ -209,7 +209,7 @@ def get_only_groups_under_spaces_starting_with(arguments: Arguments) -> List[tup
 
 def get_zone_spaces_starting_with(arguments: Arguments) -> List[tuple]:
     wanted_instances = []
-    for space in spaces.get_all_user_spaces():
+    for space in spaces.iter_all_user_spaces():
         if not space["name"].startswith(arguments.starting_with):
             continue
 
@@ -586,8 +586,11 @@ def _testOneproviders(every_provider: bool = False) -> tuple:
         every_provider or Settings.get().DATA_REPLICATION_ENABLED \
         else 1
 
-    for index in range(provider_count):
-        result = _testOneprovider(index)
+    # Oneproviders are tested concurrently, results are processed in order of providers
+    with ThreadPoolExecutor(max_workers=provider_count) as executor:
+        results = list(executor.map(_testOneprovider, range(provider_count)))
+
+    for result in results:
         # if 1, it will set 1, if 2 or 0, it will stay as is
         vector_noauth |= (result & 1)
         result >>= 1
@@ -614,18 +617,25 @@ def _test_dareg() -> int:
 
 
 def testConnection(of_each_oneprovider: bool = False):
-    # testing Onezone
-    result = _testOnezone()
-    # testing Oneprovider(s)
-    noauth, auth = _testOneproviders(of_each_oneprovider)
+    # connections to all endpoints are opened at once and tests use them from pools
+    request.prewarm_connections()
+
+    # all parties are tested concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # testing Onezone
+        onezone_result = executor.submit(_testOnezone)
+        # testing Oneprovider(s)
+        oneproviders_result = executor.submit(_testOneproviders, of_each_oneprovider)
+        # testing DAREG
+        dareg_result = executor.submit(_test_dareg)
+        # testing connection to email server
+        mail_result = executor.submit(mail.test_connection)
+
+    noauth, auth = oneproviders_result.result()
     # not using yet, discarding
-    result = result + noauth + auth
-
-    # testing DAREG
-    result += _test_dareg()
-
-    # testing connection to email server
-    result += mail.test_connection()
+    result = onezone_result.result() + noauth + auth
+    result += dareg_result.result()
+    result += mail_result.result()
 
     if result == 0:
         Logger.log(3, "Onezone, Oneprovider, DAREG and email, if enabled, exist and respond.")
@@ -1,6 +1,7 @@
 import json
 import random
 import time
+from typing import Iterator
 from settings import Settings
 from utils import Logger, Utils
 import request
@@ -37,6 +38,15 @@ def list_all_named_tokens() -> list:
     return response.json()["tokens"]
 
 
+def iter_all_named_tokens() -> Iterator[str]:
+    """
+    Streaming variant of list_all_named_tokens(), yields ids of tokens as they are received.
+    """
+    Logger.log(4, "iter_all_named_tokens()")
+    url = "onezone/users/" + Settings.get().config["serviceUserId"] + "/tokens/named"
+    yield from request.iter_json_array(url, key="tokens")
+
+
 def getNamedToken(token_id):
     Logger.log(4, "getNamedToken(%s):" % token_id)
     # https://onedata.org/#/home/api/stable/onezone?anchor=operation/get_named_token
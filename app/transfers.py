@@ -1,7 +1,9 @@
+import asyncio
 import json
 from settings import Settings
 from utils import Logger
 import request
+import async_request
 
 
 def get_transfer_status(transfer_id: str, status_type_if_not_found: str = "transferStatus") -> dict:
@@ -21,8 +23,39 @@ def get_transfer_status(transfer_id: str, status_type_if_not_found: str = "trans
     Logger.log(4, f"get_transfer_status(transfer_id={transfer_id},status_type={status_type_if_not_found}):")
     # https://onedata.org/#/home/api/stable/oneprovider?anchor=operation/get_transfer_status
     url = "oneprovider/transfers/" + transfer_id
-    response = request.get(url, ok_statuses=(200, 404))
+    # status of transfer is polled, so it cannot be cached
+    response = request.get(url, ok_statuses=(200, 404), use_cache=False)
+    return _process_transfer_status_response(response, status_type_if_not_found)
 
+
+async def get_transfer_status_async(transfer_id: str, status_type_if_not_found: str = "transferStatus") -> dict:
+    """
+    Asyncio variant of get_transfer_status()
+    """
+    Logger.log(4, f"get_transfer_status_async(transfer_id={transfer_id},status_type={status_type_if_not_found}):")
+    url = "oneprovider/transfers/" + transfer_id
+    response = await async_request.get(url, ok_statuses=(200, 404), use_cache=False)
+    return _process_transfer_status_response(response, status_type_if_not_found)
+
+
+async def _get_transfer_statuses_async(transfer_ids: list, status_type_if_not_found: str) -> list:
+    return await asyncio.gather(*[
+        get_transfer_status_async(transfer_id, status_type_if_not_found) for transfer_id in transfer_ids
+    ])
+
+
+def get_transfer_statuses(transfer_ids: list, status_type_if_not_found: str = "transferStatus") -> list:
+    """
+    Returns list of transfer infos (see get_transfer_status()) in the same order as given transfer ids.
+    When asyncio transport is selected, all statuses are requested concurrently
+    """
+    if async_request.is_enabled():
+        return async_request.run(_get_transfer_statuses_async(transfer_ids, status_type_if_not_found))
+
+    return [get_transfer_status(transfer_id, status_type_if_not_found) for transfer_id in transfer_ids]
+
+
+def _process_transfer_status_response(response, status_type_if_not_found: str) -> dict:
     if response.ok:
         return response.json()
     elif response.status_code == 404:
@@ -45,7 +78,7 @@ def get_all_transfer_ids(space_id: str, oneprovider_index: int = 0) -> list:
     find_transfers = True
     page_token = ""
     while find_transfers:
-        response = request.get(url + page_token, oneprovider_index=oneprovider_index)
+        response = request.get(url + page_token, oneprovider_index=oneprovider_index, use_cache=False)
 
         if not response.ok:
             Logger.log(4, f"Getting transfers for space with id {space_id} was not successful.:")
@@ -62,34 +95,6 @@ def get_all_transfer_ids(space_id: str, oneprovider_index: int = 0) -> list:
     return transfer_ids
 
 
-# WIP
-def createTransfer(type, replicating_provider_id, file_id, dataSourceType) -> dict:
-    Logger.log(
-        4,
-        "createTransfer(%s, %s, %s, %s):"
-        % (type, replicating_provider_id, file_id, dataSourceType),
-    )
-    # https://onedata.org/#/home/api/stable/oneprovider?anchor=operation/create_transfer
-    url = "oneprovider/transfers"
-    data = {
-        "type": type,
-        "replicatingProviderId": replicating_provider_id,
-        "dataSourceType": dataSourceType,
-        "fileId": file_id,
-    }
-
-    headers = dict({"Content-type": "application/json"})
-    response = request.post(url, headers=headers, data=json.dumps(data))
-    if response.ok:
-        return response.json()
-    else:
-        return {}
-
-
-# WIP
-def createReplicationTransfer(replicating_provider_id, file_id, dataSourceType="file"):
-    createTransfer("replication", replicating_provider_id, file_id, dataSourceType)
-
 
 def getFileDistribution(file_id):
     Logger.log(4, "getFileDistribution(%s):" % file_id)
@@ -1,3 +1,6 @@
+import contextlib
+import contextvars
+import io
 import re
 import urllib.parse
 import uuid
@@ -264,11 +267,37 @@ class Utils:
         return value
 
 
+# output of log messages, when set, messages are stored to buffer instead of printing (see Logger.buffered())
+_log_output: contextvars.ContextVar = contextvars.ContextVar("log_output", default=None)
+
+
 class Logger:
+    @staticmethod
+    @contextlib.contextmanager
+    def buffered():
+        """
+        Messages logged inside with statement (in the same thread or context) are stored to yielded buffer.
+        Used by concurrently processed datasets, their logs are printed whole one after another.
+        """
+        output = io.StringIO()
+        token = _log_output.set(output)
+        try:
+            yield output
+        finally:
+            _log_output.reset(token)
+
+    @staticmethod
+    def is_enabled(level) -> bool:
+        """
+        Returns True if messages of the given level are printed, expensive messages should be built only then.
+        """
+        return Settings.get().debug >= level
+
     @staticmethod
     def log(level, message, space_id=None, pretty_print=None):
         """
         Print the message if the global verbose level is equal or greater then the given level.
+        If pretty_print is callable, it is called (only when the message is printed) and its result is printed.
         """
         if Settings.get().debug >= level:
             current_datetime = datetime.now()
@@ -284,11 +313,14 @@ class Logger:
             elif level >= 5:
                 prefix = "verbose"
 
+            output = _log_output.get()
             # log record parts are divided by single spaces, message (msg) have to be the last part
             if space_id:
-                print("%s [%s] space=%s msg=%s" % (current_datetime, prefix, space_id, message))
+                print("%s [%s] space=%s msg=%s" % (current_datetime, prefix, space_id, message), file=output)
             else:
-                print("%s [%s] msg=%s" % (current_datetime, prefix, message))
+                print("%s [%s] msg=%s" % (current_datetime, prefix, message), file=output)
 
+            if callable(pretty_print):
+                pretty_print = pretty_print()
             if pretty_print:
-                pprint(pretty_print)
+                pprint(pretty_print, stream=output)
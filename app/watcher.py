@@ -0,0 +1,259 @@
+"""
+Watch mode, datasets are processed as soon as their trigger metadata files or running files are created or removed.
+Watched directories and all datasets in them are watched by Linux inotify (called through ctypes). Changed dataset
+is processed after settleTime seconds without any other change, so files being copied are not processed too early.
+All watched directories are scanned again every resyncInterval seconds, it finds changes missed by inotify
+(e.g. newly matching watched directories, overflow of event queue, limit of inotify watches).
+Changes made by fs2od itself (atomic rewrites of metadata files, removed running files) do not queue the dataset.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Iterator, Optional, Tuple
+import circuit_breaker
+import filesystem
+import fs_stat
+import request
+import request_metrics
+import response_cache
+import state_index
+import yaml_cache
+from settings import Settings
+from utils import Logger
+
+# constants from <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# only creation and removal of names is watched, changes of content made by fs2od itself are not interesting
+WATCHED_DIRECTORY_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | \
+    IN_ONLYDIR
+DATASET_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyError(OSError):
+    pass
+
+
+class Inotify:
+    """
+    Minimal wrapper of inotify system calls.
+    """
+    def __init__(self):
+        library = ctypes.util.find_library("c")
+        try:
+            self._libc = ctypes.CDLL(library or "libc.so.6", use_errno=True)
+            self._libc.inotify_init1.argtypes = (ctypes.c_int,)
+            self._libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+            self._libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        except (OSError, AttributeError) as e:
+            raise InotifyError(errno.ENOSYS, f"inotify is not available: {e}")
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            self._raise_error("inotify_init1")
+
+    def _raise_error(self, function: str, path: str = ""):
+        error_number = ctypes.get_errno()
+        raise InotifyError(error_number, f"{function} failed: {os.strerror(error_number)}", path or None)
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Returns watch descriptor of given path, the same path has always the same descriptor.
+        """
+        watch_descriptor = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if watch_descriptor < 0:
+            self._raise_error("inotify_add_watch", path)
+        return watch_descriptor
+
+    def read_events(self, timeout: Optional[float]) -> Iterator[Tuple[int, int, int, str]]:
+        """
+        Yields events (watch descriptor, mask, cookie, name) which came within timeout (None waits forever).
+        Both events of one rename have the same cookie.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return
+
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return
+
+            offset = 0
+            while offset < len(data):
+                watch_descriptor, mask, cookie, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+                offset += name_length
+                yield watch_descriptor, mask, cookie, name
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Watcher:
+    def __init__(self):
+        self.inotify = Inotify()
+        # watch descriptor -> (path, True if it is watched directory, False if it is dataset)
+        self.watches: dict = {}
+        # path of dataset -> time when it can be processed
+        self.pending: dict = {}
+        self.settle_time = Settings.get().config["watch"]["settleTime"]
+        self.resync_interval = Settings.get().config["watch"]["resyncInterval"]
+        self.next_resync = 0.0
+        self.watch_limit_reached = False
+        self.interesting_names = set(Settings.get().METADATA_FILES)
+        self.interesting_names.add(Settings.get().config["continousFileImport"]["runningFileName"])
+        # cookies of renames of temporary files, i.e. atomic writes of metadata files made by fs2od
+        self.own_rename_cookies: set = set()
+
+    def _add_watch(self, path: str, is_watched_directory: bool) -> None:
+        try:
+            mask = WATCHED_DIRECTORY_MASK if is_watched_directory else DATASET_MASK
+            self.watches[self.inotify.add_watch(path, mask)] = (path, is_watched_directory)
+        except InotifyError as e:
+            if e.errno == errno.ENOSPC:
+                if not self.watch_limit_reached:
+                    Logger.log(2, f"Limit of inotify watches reached (fs.inotify.max_user_watches), changes "
+                                  f"of {path} and following directories are found only by periodic resync")
+                self.watch_limit_reached = True
+            elif e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                Logger.log(2, f"Directory {path} can't be watched: {e}")
+
+    def _watch_directories(self) -> None:
+        """
+        Adds watches to all watched directories and datasets in them, existing watches are kept.
+        """
+        self.watch_limit_reached = False
+        for config_directory_entry in Settings.get().config["watchedDirectories"]:
+            for base_path in filesystem.traverse_through_directories_wrapper(config_directory_entry):
+                self._add_watch(base_path, True)
+                try:
+                    with os.scandir(base_path) as entries:
+                        for entry in entries:
+                            if fs_stat.is_dir(entry):
+                                self._add_watch(entry.path, False)
+                except OSError as e:
+                    Logger.log(2, f"Directory {base_path} can't be scanned: {e}")
+
+        Logger.log(4, f"{len(self.watches)} directories watched")
+
+    def resync(self) -> None:
+        """
+        Scans all watched directories, watches are added before the scan, so no change is missed.
+        """
+        Logger.log(3, "Watch mode - full resync of watched directories")
+        self._watch_directories()
+        self.pending.clear()
+        self.own_rename_cookies.clear()
+        circuit_breaker.reprocess_skipped_datasets()
+        response_cache.get_response_cache().start()
+        try:
+            filesystem.scan_watched_directories()
+        finally:
+            response_cache.get_response_cache().stop()
+        self.next_resync = time.monotonic() + self.resync_interval
+
+        request.log_statistics()
+        request_metrics.write_reports()
+        fs_stat.log_statistics()
+        if yaml_cache.get_yaml_cache() is not None:
+            yaml_cache.get_yaml_cache().log_statistics()
+        if state_index.get_state_index() is not None:
+            state_index.get_state_index().log_statistics()
+
+    def _queue(self, path: str) -> None:
+        if path not in self.pending:
+            Logger.log(4, f"Watch mode - change of dataset {path} found")
+        self.pending[path] = time.monotonic() + self.settle_time
+
+    def _handle_event(self, watch_descriptor: int, mask: int, cookie: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            Logger.log(2, "Watch mode - inotify event queue overflowed, resync is needed")
+            self.next_resync = 0.0
+            return
+
+        if mask & IN_IGNORED:
+            # watched directory was removed
+            self.watches.pop(watch_descriptor, None)
+            return
+
+        if watch_descriptor not in self.watches:
+            return
+        path, is_watched_directory = self.watches[watch_descriptor]
+
+        if is_watched_directory:
+            # new dataset, its trigger file can be already there (e.g. moved directory)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                dataset_path = os.path.join(path, name)
+                self._add_watch(dataset_path, False)
+                self._queue(dataset_path)
+        elif mask & IN_MOVED_FROM and name.endswith(filesystem.TEMPORARY_FILE_SUFFIX):
+            self.own_rename_cookies.add(cookie)
+        elif mask & IN_MOVED_TO and cookie in self.own_rename_cookies:
+            # metadata file rewritten by fs2od
+            self.own_rename_cookies.discard(cookie)
+        elif mask & IN_DELETE and filesystem.is_own_removal(os.path.join(path, name)):
+            # running file or trigger file removed by fs2od
+            pass
+        elif name in self.interesting_names:
+            self._queue(path)
+
+    def _process_pending(self) -> None:
+        now = time.monotonic()
+        ready = [path for path, ready_at in self.pending.items() if ready_at <= now]
+        if not ready:
+            return
+
+        for path in ready:
+            del self.pending[path]
+
+        Logger.log(3, f"Watch mode - processing {len(ready)} changed datasets")
+        response_cache.get_response_cache().start()
+        try:
+            filesystem.process_datasets(ready)
+        finally:
+            response_cache.get_response_cache().stop()
+
+    def _get_timeout(self) -> float:
+        wake_up_at = min([self.next_resync, *self.pending.values()])
+        return max(wake_up_at - time.monotonic(), 0.0)
+
+    def run(self) -> None:
+        Logger.log(3, f"Watch mode started, resync every {self.resync_interval} s")
+        try:
+            while True:
+                if time.monotonic() >= self.next_resync:
+                    self.resync()
+
+                for watch_descriptor, mask, cookie, name in self.inotify.read_events(self._get_timeout()):
+                    self._handle_event(watch_descriptor, mask, cookie, name)
+
+                self._process_pending()
+        finally:
+            self.inotify.close()
+
+
+def watch() -> None:
+    """
+    Runs watch mode until the process is stopped.
+    """
+    Watcher().run()
@@ -8,19 +8,21 @@ import actions_log
 import commander
 import dareg
 import filesystem
+import fs_stat
 import groups
 import language
 import mail
 import metadata
 import qos
+import rate_limiter
 import shares
 import spaces
+import state_index
 import storages
 import tokens
 from settings import Settings
 from utils import Logger, Utils
 
-actions_logger = actions_log.get_actions_logger()
 
 RECIPIENTS_COMMAND_MAP = commander.CommandMap({
         "to": commander.Command(mail.Recipients.add_to),
@@ -86,10 +88,18 @@ def _add_qos_requirement(space_id: str, replicas_number: int):
 
 
 def register_space(directory: os.DirEntry) -> bool:
+    """
+    Creates space for directory and all related stuff, requests are served before maintenance of existing spaces.
+    """
+    with rate_limiter.priority_scope(rate_limiter.PRIORITY_REGISTRATION):
+        return _register_space(directory)
+
+
+def _register_space(directory: os.DirEntry) -> bool:
     # only directories should be processed
     full_path = os.path.abspath(directory.path)
     base_path = os.path.dirname(full_path)
-    if not os.path.isdir(full_path):
+    if not fs_stat.is_dir(directory):
         Logger.log(3, f"Space can't be created, this isn't directory {full_path}")
         return False
 
@@ -126,6 +136,7 @@ def register_space(directory: os.DirEntry) -> bool:
         Logger.log(2, f"Dataset name {directory.name} can't be cleared")
         return False
 
+    actions_logger = actions_log.get_actions_logger()
     actions_logger.new_actions_log()
 
     actions_logger.log_pre("space", dataset_name)
@@ -254,6 +265,7 @@ def register_space(directory: os.DirEntry) -> bool:
         is_ok = actions_logger.log_post(status, only_check=True)
         if not is_ok: return False
 
+    # waiting for propagation of the new space, its fileId is not known before
     time.sleep(3 * Settings.get().config["sleepFactor"])
 
     actions_logger.log_pre("file_id", "")
@@ -273,7 +285,8 @@ def register_space(directory: os.DirEntry) -> bool:
     if Settings.get().config["dareg"]["enabled"]:
         dareg.update_dataset(space_id, token["token"], share["publicUrl"])
 
-    time.sleep(Settings.get().config["sleepFactor"])
+    # waiting for propagation of the new share before it is updated
+    time.sleep(1 * Settings.get().config["sleepFactor"])
 
     actions_logger.log_pre("share_description", "")
     share_description = shares.create_share_description(directory)[0]
@@ -327,11 +340,15 @@ def register_space(directory: os.DirEntry) -> bool:
 
     send_email_about_creation(directory, yml_access_info_file)
 
+    index = state_index.get_state_index()
+    if index is not None:
+        index.update(directory.path, space_id=space_id, storage_id=storage_id, group_id=gid, share_id=share["shareId"])
+
     path = base_path + os.sep + directory.name
     Logger.log(3, "Processing of %s done." % path)
     if Settings.get().config["dareg"]["enabled"]:
         dareg.log(space_id, "info", "processing done")
-    time.sleep(3 * Settings.get().config["sleepFactor"])
+    rate_limiter.sleep_for_backpressure(3)
 
     actions_logger.finish_actions_log()
 
@@ -0,0 +1,104 @@
+"""
+Process-wide LRU cache of parsed YAML files (trigger metadata files, .fs2od files). Entries are keyed by path,
+inode, modification time and size of the file, so any change of the file makes its entry invalid. Writes
+made by fs2od invalidate the entry explicitly, the modification time may not change on coarse filesystems.
+Callers always get their own deep copy, so they can modify it before writing it back.
+"""
+import collections
+import copy
+import os
+import threading
+from typing import Optional
+from settings import Settings
+from utils import Logger
+
+
+class YamlCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+        # sum of parse times of files served from cache
+        self.saved_time: float = 0.0
+        # path -> (key, parsed content, parse time)
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(stat_result: os.stat_result) -> tuple:
+        return stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size
+
+    def get(self, path: str, key: tuple) -> Optional[dict]:
+        """
+        Returns copy of parsed content of the file or None if it is not cached (or it changed).
+        """
+        path = os.path.normpath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != key:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(path)
+            self.hits += 1
+            self.saved_time += entry[2]
+            content = entry[1]
+
+        return copy.deepcopy(content)
+
+    def put(self, path: str, key: tuple, content: dict, parse_time: float) -> None:
+        path = os.path.normpath(path)
+        content = copy.deepcopy(content)
+        with self._lock:
+            self._entries[path] = (key, content, parse_time)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Removes entry of the file, called after fs2od writes to it.
+        """
+        with self._lock:
+            if self._entries.pop(os.path.normpath(path), None) is not None:
+                self.invalidations += 1
+
+    def log_statistics(self) -> None:
+        with self._lock:
+            loads_count = self.hits + self.misses
+            if loads_count == 0:
+                return
+
+            Logger.log(3, f"YAML cache: {self.hits} hits, {self.misses} misses (hit ratio "
+                          f"{self.hits / loads_count:.1%}), {self.invalidations} invalidated entries, "
+                          f"{self.saved_time * 1000:.1f} ms of parsing saved")
+
+
+_yaml_cache: Optional[YamlCache] = None
+_yaml_cache_lock = threading.Lock()
+
+
+def get_yaml_cache() -> Optional[YamlCache]:
+    """
+    Returns YAML cache or None if it is disabled in configuration file.
+    """
+    global _yaml_cache
+    cache_config = Settings.get().config["yamlCache"]
+    if not cache_config["enabled"]:
+        return None
+
+    with _yaml_cache_lock:
+        if _yaml_cache is None:
+            _yaml_cache = YamlCache(cache_config["maxEntries"])
+
+    return _yaml_cache
+
+
+def invalidate(path: str) -> None:
+    """
+    Invalidates cached content of the file, if the cache is enabled.
+    """
+    cache = get_yaml_cache()
+    if cache is not None:
+        cache.invalidate(path)
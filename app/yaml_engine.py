@@ -0,0 +1,46 @@
+"""
+Loading and dumping of metadata files. Loading uses libyaml (C) parser when ruamel.yaml.clib is installed,
+otherwise the pure Python parser. Dumping keeps fs2od formatting (width 200, items of sequences indented
+by 4 with dash at offset 2) by the round-trip emitter, libyaml emitter can't indent sequences this way.
+YAML instances are reused, each thread has its own one, because they are not thread-safe.
+"""
+import io
+import threading
+from typing import Any
+import ruamel.yaml
+
+WIDTH = 200
+
+_local = threading.local()
+
+
+def _get_loader() -> ruamel.yaml.YAML:
+    if not hasattr(_local, "loader"):
+        # uses C parser of ruamel.yaml.clib when it is installed
+        _local.loader = ruamel.yaml.YAML(typ="safe")
+    return _local.loader
+
+
+def _get_dumper() -> ruamel.yaml.YAML:
+    if not hasattr(_local, "dumper"):
+        dumper = ruamel.yaml.YAML()
+        dumper.width = WIDTH  # count of characters on a line, if there is more chars, line is broken
+        dumper.indent(sequence=4, offset=2)
+        _local.dumper = dumper
+    return _local.dumper
+
+
+def load(stream) -> Any:
+    """
+    Parses YAML document from bytes, string or file.
+    """
+    return _get_loader().load(stream)
+
+
+def dump(data: Any) -> str:
+    """
+    Returns YAML document in fs2od formatting.
+    """
+    stream = io.StringIO()
+    _get_dumper().dump(data, stream)
+    return stream.getvalue()
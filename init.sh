@@ -4,8 +4,13 @@
 export START_TIME=`date -Is | sed 's/+/\n/g' | head -n 1`
 
 if $RUN_PERIODICALLY; then
-    # run processing
-    python3 fs2od.py scan $FS2OD_ARGS
+    if [ "$WATCH_MODE" = "true" ]; then
+        # process new datasets as soon as they appear, runs until the container is stopped
+        python3 fs2od.py watch $FS2OD_ARGS
+    else
+        # run processing
+        python3 fs2od.py scan $FS2OD_ARGS
+    fi
 
     # waiting
     python3 waiting.py